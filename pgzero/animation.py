@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""
+Animações que olham para os dois lados a partir de um só conjunto de quadros.
+
+Os quadros são desenhados olhando para a direita; os que olham para a
+esquerda são os mesmos espelhados com pygame.transform.flip, feitos uma vez
+só quando a animação é criada. Assim não é preciso carregar (nem manter na
+memória da folha de sprites) um segundo conjunto de imagens para a esquerda.
+"""
+import pygame
+
+# quadros já espelhados, pela superfície original
+_mirrored = {}
+
+
+def mirror(frame, box_width):
+    """Frame (surface, (dx, dy)) flipped left-right inside a box of box_width"""
+    surf, (dx, dy) = frame
+    flipped = _mirrored.get(surf)
+    if flipped is None:
+        flipped = _mirrored[surf] = pygame.transform.flip(surf, True, False)
+    # o deslocamento é medido do outro lado da caixa
+    return flipped, (box_width - dx - surf.get_width(), dy)
+
+
+class Animation:
+    """Right-facing frames and their mirror images, picked by facing"""
+    def __init__(self, frames, box_width):
+        self.right = list(frames)
+        self.left = [mirror(frame, box_width) for frame in self.right]
+
+    def __len__(self):
+        return len(self.right)
+
+    def frame(self, index, facing='right'):
+        frames = self.left if facing == 'left' else self.right
+        return frames[index % len(frames)]
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+Fundos de tela prontos para desenhar rápido.
+
+As imagens de fundo não têm o tamanho da janela (Background.png tem
+1024x614) e o pgzero as carrega com transparência (convert_alpha), então cada
+quadro faz um blit com mistura de alfa de uma imagem maior que a tela.
+
+Aqui cada fundo é redimensionado uma vez para cobrir a janela sem deformar
+(mantendo a proporção da imagem e cortando as sobras, centralizado, como o
+Actor no meio da tela mostrava) e gravado em images/.cache/; as execuções seguintes leem a versão pronta enquanto a
+imagem original não mudar. Depois de lida, a imagem é convertida para o
+formato de pixel da tela e sem alfa (convert), que é o blit mais rápido que o
+pygame tem. Os sprites já passam pelo convert_alpha do pgzero e não precisam
+disto.
+
+Uso:
+    python asset_cache.py   # gera os fundos de todas as imagens em images/
+"""
+import os
+import sys
+
+import pygame
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+IMAGES_DIR = os.path.join(HERE, 'images')
+CACHE_DIR = os.path.join(IMAGES_DIR, '.cache')
+
+_surfaces = {}
+
+
+def find_image(name):
+    """Path of images/<name>, ignoring case (Background.png == background.png)"""
+    if not os.path.splitext(name)[1]:
+        name += '.png'
+    path = os.path.join(IMAGES_DIR, name)
+    if os.path.exists(path):
+        return path
+    lower = name.lower()
+    for filename in os.listdir(IMAGES_DIR):
+        if filename.lower() == lower:
+            return os.path.join(IMAGES_DIR, filename)
+    raise FileNotFoundError(f"no image {name} in {IMAGES_DIR}")
+
+
+def cache_path(name, size):
+    base = os.path.splitext(os.path.basename(name))[0].lower()
+    return os.path.join(CACHE_DIR, f'{base}_{size[0]}x{size[1]}_cover.png')
+
+
+def cover(surf, size):
+    """surf scaled to cover size keeping its proportions, cropped to the centre"""
+    w, h = surf.get_size()
+    scale = max(size[0] / w, size[1] / h)
+    scaled = (max(size[0], round(w * scale)), max(size[1], round(h * scale)))
+    if scaled != (w, h):
+        surf = pygame.transform.smoothscale(surf, scaled)
+    crop = pygame.Rect((0, 0), size)
+    crop.center = (scaled[0] // 2, scaled[1] // 2)
+    return surf.subsurface(crop).copy()
+
+
+def build(name, size):
+    """Scale images/<name> to cover size, save it in the cache and return it"""
+    surf = pygame.image.load(find_image(name))
+    if surf.get_size() != tuple(size):
+        surf = cover(surf, size)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        pygame.image.save(surf, cache_path(name, size))
+    except (OSError, pygame.error):
+        pass  # pasta sem permissão de escrita: fica só na memória
+    return surf
+
+
+def load_image(name):
+    """images/<name> decoded but not converted (safe outside the main thread)"""
+    return pygame.image.load(find_image(name))
+
+
+def prepare(surf, alpha=False):
+    """Convert surf to the display pixel format, if there is a display"""
+    if pygame.display.get_surface() is None:
+        return surf  # sem janela (headless.py): não há formato para converter
+    return surf.convert_alpha() if alpha else surf.convert()
+
+
+def load_background(name, size):
+    """Image scaled to cover size, read from the cache when it is up to date.
+
+    Not converted yet, so it can run outside the main thread (preloader.py).
+    """
+    cached = cache_path(name, size)
+    if (os.path.exists(cached)
+            and os.path.getmtime(cached) >= os.path.getmtime(find_image(name))):
+        return pygame.image.load(cached)
+    return build(name, size)
+
+
+def background(name, size, surf=None):
+    """Opaque image covering size, ready for screen.blit(surf, (0, 0));
+    surf is an already loaded load_background() result"""
+    key = (name, tuple(size))
+    ready = _surfaces.get(key)
+    if ready is not None:
+        return ready
+    if surf is None:
+        surf = load_background(name, size)
+    ready = _surfaces[key] = prepare(surf)
+    return ready
+
+
+if __name__ == '__main__':
+    size = tuple(int(v) for v in sys.argv[1:3]) if len(sys.argv) > 2 else (800, 600)
+    for filename in sorted(os.listdir(IMAGES_DIR)):
+        if 'background' in filename.lower():
+            build(filename, size)
+            print(f"{filename} -> {cache_path(filename, size)}")
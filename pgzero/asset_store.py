@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+Recursos endereçados pelo conteúdo.
+
+Vários arquivos do projeto são cópias byte a byte uns dos outros: as quatro
+imagens do herói olhando para a esquerda, music/background_music.mp3 e
+music/bg_music.mp3, sounds/Death.wav e sounds/hit.wav. Aqui cada arquivo é
+identificado pelo SHA-256 do seu conteúdo (o "blob"); os nomes usados no
+código (MUSIC, JUMP_SOUND, as listas de quadros...) apontam para o blob, e
+cada blob é carregado uma vez só, não importa por quantos nomes.
+
+Os hashes ficam guardados num manifesto (images/.cache/assets.json) e só
+são recalculados para arquivos cujo tamanho ou data mudaram.
+
+Uso:
+    python asset_store.py   # lista as cópias repetidas e o espaço que ocupam
+"""
+import os
+import json
+import hashlib
+
+import asset_cache
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+# pastas de onde os jogos carregam recursos
+FOLDERS = ('images', 'sounds', 'music')
+# pastas com cópias antigas dos sprites, só conferidas pelo relatório
+ARCHIVE_FOLDERS = ('hero_sprites_transparent', 'old')
+MANIFEST = os.path.join(asset_cache.CACHE_DIR, 'assets.json')
+
+
+def file_digest(path):
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b''):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+class AssetStore:
+    """Maps logical names (folder, file name) to content hashes and keeps
+    one loaded object per hash"""
+    def __init__(self, root=HERE, folders=FOLDERS, manifest=MANIFEST):
+        self.root = root
+        self.folders = folders
+        self.manifest = manifest
+        # 'images/hero_idle_left_0.png' -> hash
+        self.names = {}
+        # hash -> primeiro caminho com esse conteúdo
+        self.blobs = {}
+        # (hash, loader) -> objeto carregado
+        self.loaded = {}
+        self.scan()
+
+    def scan(self):
+        """Hash every file of the folders, reusing the manifest entries of
+        files whose size and modification time did not change"""
+        try:
+            with open(self.manifest, encoding='utf-8') as f:
+                known = json.load(f)
+        except (OSError, ValueError):
+            known = {}
+        entries = {}
+        for folder in self.folders:
+            base = os.path.join(self.root, folder)
+            if not os.path.isdir(base):
+                continue
+            for filename in sorted(os.listdir(base)):
+                path = os.path.join(base, filename)
+                if filename.startswith('.') or not os.path.isfile(path):
+                    continue
+                stat = os.stat(path)
+                name = f'{folder}/{filename}'
+                entry = known.get(name)
+                if entry is None or entry[:2] != [stat.st_size, stat.st_mtime]:
+                    entry = [stat.st_size, stat.st_mtime, file_digest(path)]
+                entries[name] = entry
+                self.names[name] = entry[2]
+                self.blobs.setdefault(entry[2], name)
+        if entries != known:
+            try:
+                os.makedirs(os.path.dirname(self.manifest), exist_ok=True)
+                with open(self.manifest, 'w', encoding='utf-8') as f:
+                    json.dump(entries, f, indent=1)
+            except OSError:
+                pass  # sem permissão de escrita: recalcula na próxima vez
+
+    def logical(self, folder, name):
+        """Key of a name as the games write it: case and, like pgzero,
+        the extension are optional"""
+        key = f'{folder}/{name}'
+        if key in self.names:
+            return key
+        lower = key.lower()
+        for known in self.names:
+            if known.lower() == lower or os.path.splitext(known)[0].lower() == lower:
+                return known
+        raise KeyError(f"no asset {name} in {folder}/")
+
+    def digest(self, folder, name):
+        return self.names[self.logical(folder, name)]
+
+    def resolve(self, folder, name):
+        """Path of the one file kept for the content of folder/name"""
+        return os.path.join(self.root, self.blobs[self.digest(folder, name)])
+
+    def load(self, folder, name, loader):
+        """loader(path) of the blob behind folder/name, run once per blob"""
+        key = (self.digest(folder, name), loader)
+        obj = self.loaded.get(key)
+        if obj is None:
+            obj = self.loaded[key] = loader(self.resolve(folder, name))
+        return obj
+
+    def group(self, folder, names):
+        """Names of one folder grouped by blob: {hash: [names, ...]}"""
+        groups = {}
+        for name in names:
+            groups.setdefault(self.digest(folder, name), []).append(name)
+        return groups
+
+    def duplicates(self):
+        """{hash: [logical names]} for every blob with more than one name"""
+        groups = {}
+        for name, digest in self.names.items():
+            groups.setdefault(digest, []).append(name)
+        return {digest: names for digest, names in groups.items() if len(names) > 1}
+
+
+if __name__ == '__main__':
+    store = AssetStore(folders=FOLDERS + ARCHIVE_FOLDERS)
+    wasted = 0
+    for digest, names in sorted(store.duplicates().items(), key=lambda item: item[1]):
+        size = os.path.getsize(os.path.join(HERE, names[0]))
+        wasted += size * (len(names) - 1)
+        print(f"{digest[:12]}  {size:>9,} bytes  " + ", ".join(names))
+    print(f"{len(store.names)} arquivos, {len(store.blobs)} conteúdos distintos, "
+          f"{wasted:,} bytes repetidos")
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""
+Folha de sprites (atlas) com todos os quadros de animação.
+
+Em vez de abrir um PNG por quadro, os quadros são colados numa imagem só
+(images/.cache/sprites.png) e um índice em JSON (sprites.json) guarda onde
+cada um ficou. No jogo a folha é lida uma vez e cada quadro vira uma
+subsurface dela: nenhum pixel é copiado e todos os quadros ficam juntos na
+memória. Quadros com pixels idênticos ocupam um lugar só na folha.
+
+Os PNGs têm tamanhos bem diferentes entre si (de 35x41 a 80x80) e muita
+borda transparente, enquanto o jogo usa um rect fixo para cada personagem.
+Na montagem da folha cada quadro é recortado (sem a borda transparente),
+reduzido ou ampliado para caber na caixa do personagem e alinhado pelo
+centro de baixo (os pés). Em vez de guardar a borda, o índice guarda o
+deslocamento do quadro dentro da caixa; no jogo basta somá-lo à posição do
+rect, sem redimensionar nem realinhar nada a cada quadro.
+
+A folha é refeita sozinha quando falta, quando a lista de quadros muda ou
+quando algum PNG fica mais novo que ela. Um nome que não está no índice é
+lido do PNG avulso, como antes.
+
+Uso:
+    python atlas.py   # gera a folha com os quadros de FRAMES
+"""
+import os
+import json
+import hashlib
+
+import pygame
+
+import asset_cache
+
+SHEET = 'sprites'
+MAX_WIDTH = 512  # largura máxima da folha, em pixels
+PADDING = 1  # espaço entre quadros, para a filtragem não misturar vizinhos
+
+# caixas de colisão dos personagens do game2.py
+HERO_BOX = (48, 64)
+ENEMY_BOX = (48, 48)
+
+# quadros de animação do herói e dos inimigos e a caixa de cada um; os que
+# olham para a esquerda são espelhados no jogo (ver animation.py)
+FRAMES = {
+    "hero_idle_right_0.png": HERO_BOX, "hero_idle_right_1.png": HERO_BOX,
+    "hero_run_right_0.png": HERO_BOX, "hero_run_right_1.png": HERO_BOX,
+    "enemy_idle_0.png": ENEMY_BOX, "enemy_idle_1.png": ENEMY_BOX,
+}
+
+
+def sheet_paths(sheet=SHEET):
+    base = os.path.join(asset_cache.CACHE_DIR, sheet)
+    return base + '.png', base + '.json'
+
+
+def normalize(surf, box):
+    """Trim the transparent border of surf, scale it to fit box keeping its
+    proportions and anchor it at the bottom center of box.
+
+    Returns the trimmed surface and its (dx, dy) offset inside box.
+    """
+    bounds = surf.get_bounding_rect()
+    if not bounds.w or not bounds.h:
+        return surf, (0, 0)  # quadro todo transparente
+    surf = surf.subsurface(bounds)
+    scale = min(box[0] / bounds.w, box[1] / bounds.h)
+    size = (max(1, round(bounds.w * scale)), max(1, round(bounds.h * scale)))
+    if size == bounds.size:
+        surf = surf.copy()
+    else:
+        surf = pygame.transform.smoothscale(surf, size)
+    return surf, ((box[0] - size[0]) // 2, box[1] - size[1])
+
+
+def _load_frame(name, box):
+    surf = pygame.image.load(asset_cache.find_image(name))
+    surf = surf.convert_alpha() if pygame.display.get_surface() else surf
+    if box is None:
+        return surf, (0, 0)
+    return normalize(surf, box)
+
+
+def pack(sizes, max_width=MAX_WIDTH, padding=PADDING):
+    """Shelf packing: place (w, h) boxes in rows, tallest first.
+
+    Returns the (x, y) of each box, in the order of sizes, and the size of
+    the sheet.
+    """
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0]))
+    width = max([max_width] + [w + 2 * padding for w, h in sizes])
+    places = [None] * len(sizes)
+    x = y = padding
+    row_h = 0
+    for i in order:
+        w, h = sizes[i]
+        if x + w + padding > width:
+            x = padding
+            y += row_h + padding
+            row_h = 0
+        places[i] = (x, y)
+        x += w + padding
+        row_h = max(row_h, h)
+    used_w = max([x + w for (x, y), (w, h) in zip(places, sizes)], default=0)
+    return places, (used_w + padding, y + row_h + padding)
+
+
+def build(frames=FRAMES, sheet=SHEET):
+    """Normalize and pack the frames into images/.cache/<sheet>.png and .json"""
+    images = {}
+    unique = {}  # hash dos pixels -> primeiro nome com esses pixels
+    alias = {}
+    offsets = {}
+    for name, box in frames.items():
+        surf, offsets[name] = _load_frame(name, box)
+        digest = hashlib.sha1(pygame.image.tostring(surf, 'RGBA')
+                              + repr(surf.get_size()).encode()).hexdigest()
+        if digest in unique:
+            alias[name] = unique[digest]
+        else:
+            unique[digest] = name
+            images[name] = surf
+
+    packed = list(images)
+    places, size = pack([images[name].get_size() for name in packed])
+    sheet_surf = pygame.Surface(size, pygame.SRCALPHA, 32)
+    rects = {}
+    for name, (x, y) in zip(packed, places):
+        sheet_surf.blit(images[name], (x, y))
+        rects[name] = [x, y] + list(images[name].get_size())
+    for name, original in alias.items():
+        rects[name] = rects[original]
+    # x, y, largura e altura na folha, deslocamento dentro da caixa
+    index = {name: rects[name] + list(offsets[name]) for name in frames}
+
+    png_path, json_path = sheet_paths(sheet)
+    os.makedirs(asset_cache.CACHE_DIR, exist_ok=True)
+    pygame.image.save(sheet_surf, png_path)
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump({'frames': _listing(frames), 'index': index}, f, indent=1)
+    return sheet_surf, index
+
+
+def _listing(frames):
+    return [[name] + (list(box) if box else []) for name, box in frames.items()]
+
+
+def _stale(frames, sheet):
+    png_path, json_path = sheet_paths(sheet)
+    if not (os.path.exists(png_path) and os.path.exists(json_path)):
+        return True
+    with open(json_path, encoding='utf-8') as f:
+        if json.load(f).get('frames') != _listing(frames):
+            return True
+    built = min(os.path.getmtime(png_path), os.path.getmtime(json_path))
+    return any(os.path.getmtime(asset_cache.find_image(name)) > built
+               for name in frames)
+
+
+class Atlas:
+    """One sheet surface and, for each frame, its rect in the sheet and its
+    offset inside the character box"""
+    def __init__(self, sheet, index, frames=FRAMES):
+        self.sheet = sheet
+        self.index = index
+        self.boxes = frames
+        self.sprites = {}
+
+    @classmethod
+    def load(cls, frames=FRAMES, sheet=SHEET):
+        """Read the sheet, building it first if it is missing or stale"""
+        try:
+            if _stale(frames, sheet):
+                sheet_surf, index = build(frames, sheet)
+            else:
+                png_path, json_path = sheet_paths(sheet)
+                sheet_surf = pygame.image.load(png_path)
+                with open(json_path, encoding='utf-8') as f:
+                    index = json.load(f)['index']
+        except (OSError, pygame.error):
+            # sem folha (pasta sem escrita, por exemplo): só PNGs avulsos
+            return cls(None, {}, frames)
+        return cls(asset_cache.prepare(sheet_surf, alpha=True), index, frames)
+
+    def frame(self, name):
+        """(surface, (dx, dy)) of one frame, made once; blit the surface at
+        the top-left corner of the character box plus (dx, dy)"""
+        sprite = self.sprites.get(name)
+        if sprite is None:
+            entry = self.index.get(name)
+            if entry is not None:
+                sprite = (self.sheet.subsurface(entry[:4]), tuple(entry[4:6]))
+            else:
+                surf, offset = _load_frame(name, self.boxes.get(name))
+                sprite = (asset_cache.prepare(surf, alpha=True), offset)
+            self.sprites[name] = sprite
+        return sprite
+
+    def frames(self, names):
+        return [self.frame(name) for name in names]
+
+    def __contains__(self, name):
+        return name in self.index
+
+
+if __name__ == '__main__':
+    sheet_surf, index = build()
+    w, h = sheet_surf.get_size()
+    print(f"{sheet_paths()[0]}: {w}x{h}, {len(index)} quadros, "
+          f"{len({tuple(r[:4]) for r in index.values()})} distintos")
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+Efeitos sonoros decodificados antes do jogo começar.
+
+O pgzero só lê um som na primeira vez que ele toca, dentro do update(), e
+não aceita MP3 (o Death.mp3). Aqui cada efeito é decodificado para PCM uma
+vez, no carregamento (um pygame.mixer.Sound guarda as amostras já
+decodificadas), e tocado num conjunto fixo de canais do mixer:
+
+- se todos os canais estão ocupados, o som que toca há mais tempo é
+  interrompido para dar lugar ao novo (voice stealing);
+- o mesmo efeito não é repetido antes de MIN_INTERVAL segundos, então dez
+  inimigos batendo no mesmo quadro tocam o som uma vez só.
+
+Sem placa de som (ou com o mixer desligado) o banco fica mudo, sem erro.
+"""
+import time
+
+import pygame
+
+from asset_store import AssetStore
+
+MAX_CHANNELS = 8  # canais do mixer usados pelos efeitos
+MIN_INTERVAL = 0.05  # segundos mínimos entre duas vezes o mesmo efeito
+
+
+class AudioBank:
+    """Pre-decoded sound effects on a bounded pool of mixer channels"""
+    def __init__(self, store=None, channels=MAX_CHANNELS,
+                 min_interval=MIN_INTERVAL, clock=time.monotonic):
+        # arquivos iguais (Death.wav e hit.wav) são decodificados uma vez
+        self.store = store if store is not None else AssetStore()
+        self.min_interval = min_interval
+        self.clock = clock
+        self.sounds = {}
+        self.last_played = {}
+        self.played = 0
+        self.skipped = 0
+        self.stolen = 0
+        self.channels = []
+        self.started = []
+        if pygame.mixer.get_init():
+            if pygame.mixer.get_num_channels() < channels:
+                pygame.mixer.set_num_channels(channels)
+            self.channels = [pygame.mixer.Channel(i) for i in range(channels)]
+            self.started = [0.0] * channels
+
+    @property
+    def enabled(self):
+        return bool(self.channels)
+
+    def decode(self, filename):
+        """Sound with the decoded samples of sounds/<filename>, or None
+        without a mixer (can run on the preloader thread)"""
+        if not self.enabled:
+            return None
+        return self.store.load('sounds', filename, pygame.mixer.Sound)
+
+    def add(self, key, sound):
+        self.sounds[key] = sound
+        return sound
+
+    def load(self, key, filename):
+        return self.add(key, self.decode(filename))
+
+    def play(self, key):
+        """Play effect key; return its channel, or None if it was skipped"""
+        sound = self.sounds.get(key)
+        if sound is None:
+            return None
+        now = self.clock()
+        if now - self.last_played.get(key, -self.min_interval) < self.min_interval:
+            self.skipped += 1
+            return None
+        self.last_played[key] = now
+
+        # canal livre ou, se não houver, o que está tocando há mais tempo
+        index = None
+        for i, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                index = i
+                break
+        if index is None:
+            index = min(range(len(self.channels)), key=self.started.__getitem__)
+            self.stolen += 1
+        channel = self.channels[index]
+        channel.play(sound)
+        self.started[index] = now
+        self.played += 1
+        return channel
+
+    def stop(self):
+        for channel in self.channels:
+            channel.stop()
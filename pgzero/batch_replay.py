@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""
+Reprodução em lote de partidas do game2.py, em vários núcleos.
+
+Repete sem janela, o mais rápido possível, muitas partidas gravadas com o
+replay.py e/ou partidas de um robô que corre para a direita e pula ao acaso
+(cada robô tem a sua semente, então a mesma execução dá o mesmo resultado).
+As partidas são divididas entre processos (multiprocessing.Pool); cada
+processo carrega o jogo uma vez só e reaproveita para todas as partidas que
+receber.
+
+De cada partida saem: mortes, passo em que chegou ao fim da fase (se chegou)
+e o custo médio e máximo de um passo de física. O robô para ao chegar ao fim;
+uma partida gravada vai até o último passo, para que mortes e posição final
+possam ser comparadas com a gravação. Tudo vai para um único JSON,
+com um resumo no topo, para conferir uma mudança de fase contra muitas
+partidas de uma vez.
+
+Uso:
+    python batch_replay.py [partida.json ...] [--bots 200] [--ticks 6000]
+                           [--level level1] [--seed 1] [--workers N]
+                           [--out batch_replay.json]
+"""
+import os
+import sys
+import json
+import time
+import random
+import statistics
+import multiprocessing
+
+from replay import KEYS, ReplayPlayer, load_session
+
+_game = None  # jogo carregado em cada processo do pool
+
+
+def _init_worker():
+    global _game
+    import headless
+    _game = headless.load_game()
+
+
+def bot_session(seed, level, ticks, step):
+    """Session dict for a random bot run: mostly running right, jumping"""
+    rng = random.Random(seed)
+    keys = []
+    tick = 0
+    while tick < ticks:
+        roll = rng.random()
+        if roll < 0.6:
+            pressed = ['right']
+        elif roll < 0.9:
+            pressed = ['right', 'up']
+        elif roll < 0.95:
+            pressed = ['left']
+        else:
+            pressed = []
+        keys.append([tick, [key for key in KEYS if key in pressed]])
+        tick += rng.randrange(10, 120)
+    return {'seed': seed, 'level': level, 'step': step, 'ticks': ticks,
+            'keys': keys, 'mouse': []}
+
+
+def play(job):
+    """Replay one job in this worker and return its outcome row"""
+    kind, arg = job
+    game = _game
+    if kind == 'session':
+        name, session = arg, load_session(arg)
+    else:
+        seed, level, ticks = arg
+        name, session = f"bot-{seed}", bot_session(seed, level, ticks, game.physics.step)
+
+    costs = []
+    goal = []
+    last = [None]
+    # só o robô para no fim da fase; a gravação é repetida inteira
+    stop_at_goal = kind != 'session'
+
+    def on_tick(game, tick):
+        now = time.perf_counter()
+        # o primeiro passo fica de fora: o intervalo incluiria montar a fase
+        if last[0] is not None:
+            costs.append(now - last[0])
+        last[0] = now
+        if not goal and game.hero.rect.right >= game.world.width:
+            goal.append(tick + 1)
+            return stop_at_goal
+        return False
+
+    ReplayPlayer(session).run(game, on_tick)
+    ticks = len(costs) + 1
+    final = session.get('final')
+    return {
+        'name': name,
+        'level': session['level'],
+        'seed': session['seed'],
+        'ticks': ticks,
+        'deaths': game.deaths,
+        'goal_s': goal[0] * session['step'] if goal else None,
+        'hero': [game.hero.x, game.hero.y],
+        # partida gravada: terminou no mesmo lugar que na gravação?
+        'same_end': [game.hero.x, game.hero.y] == final['hero'] if final else None,
+        'tick_mean_us': sum(costs) / max(len(costs), 1) * 1e6,
+        'tick_max_us': max(costs, default=0.0) * 1e6,
+    }
+
+
+def summarize(rows):
+    goals = [r['goal_s'] for r in rows if r['goal_s'] is not None]
+    deaths = [r['deaths'] for r in rows]
+    ticks = sum(r['ticks'] for r in rows)
+    return {
+        'runs': len(rows),
+        'ticks': ticks,
+        'deaths_total': sum(deaths),
+        'deaths_mean': statistics.mean(deaths) if deaths else 0.0,
+        'goals': len(goals),
+        'goal_median_s': statistics.median(goals) if goals else None,
+        'diverged': sum(r['same_end'] is False for r in rows),
+        'tick_mean_us': (sum(r['tick_mean_us'] * r['ticks'] for r in rows) / ticks
+                         if ticks else 0.0),
+        'tick_max_us': max((r['tick_max_us'] for r in rows), default=0.0),
+    }
+
+
+def run(sessions=(), bots=0, ticks=6000, level='level1', seed=1, workers=None):
+    """Replay sessions and bot runs on a process pool; return the report"""
+    jobs = [('session', path) for path in sessions]
+    jobs += [('bot', (seed + i, level, ticks)) for i in range(bots)]
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    with multiprocessing.Pool(min(workers, max(len(jobs), 1)), _init_worker) as pool:
+        rows = list(pool.imap_unordered(play, jobs, chunksize=max(1, len(jobs) // (4 * workers))))
+    elapsed = time.perf_counter() - start
+    rows.sort(key=lambda r: r['name'])
+    summary = summarize(rows)
+    summary['workers'] = workers
+    summary['elapsed_s'] = elapsed
+    return {'summary': summary, 'runs': rows}
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('sessions', nargs='*')
+    parser.add_argument('--bots', type=int, default=0)
+    parser.add_argument('--ticks', type=int, default=6000)
+    parser.add_argument('--level', default='level1')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--out', default='batch_replay.json')
+    args = parser.parse_args(argv)
+    if not args.sessions and not args.bots:
+        parser.error("passe partidas gravadas e/ou --bots N")
+
+    report = run(args.sessions, args.bots, args.ticks, args.level, args.seed, args.workers)
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=1)
+    s = report['summary']
+    goal = f"{s['goal_median_s']:.1f}s" if s['goal_median_s'] is not None else "-"
+    print(f"{s['runs']} partidas, {s['ticks']} passos em {s['elapsed_s']:.2f}s "
+          f"({s['workers']} processos, {s['ticks'] / max(s['elapsed_s'], 1e-9):,.0f} passos/s)")
+    print(f"mortes: {s['deaths_total']} (média {s['deaths_mean']:.2f}); "
+          f"chegaram ao fim: {s['goals']}, mediana {goal}")
+    if s['diverged']:
+        print(f"{s['diverged']} partidas gravadas terminaram diferente da gravação")
+    print(f"passo: média {s['tick_mean_us']:.1f} us, máximo {s['tick_max_us']:.1f} us")
+    print(f"resultado em {args.out}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
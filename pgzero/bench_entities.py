@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+Compara memória e velocidade das classes do game2.py com e sem __slots__.
+
+Para cada classe (Hero, Enemy, Platform, Button) é criada uma cópia "como era
+antes", com o mesmo código mas com __dict__ por instância, e as duas versões
+são medidas com 10 mil e 100 mil entidades.
+
+Uso:
+    python bench_entities.py [--sizes 10000 100000]
+"""
+import gc
+import time
+import tracemalloc
+
+from pygame import Rect
+
+import headless
+
+
+def without_slots(cls):
+    """Same class with an instance __dict__, as before the __slots__ change"""
+    slots = set(cls.__slots__)
+    body = {name: value for name, value in vars(cls).items()
+            if name not in slots and name not in ('__slots__', '__dict__', '__weakref__')}
+    return type(cls.__name__, cls.__bases__, body)
+
+
+def factories(game):
+    """Name -> (class, function that builds the i-th instance)"""
+    return {
+        'Hero': (game.Hero, lambda cls, i: cls((i % 800, 100))),
+        'Enemy': (game.Enemy, lambda cls, i: cls(i % 800, i % 800 + 100, 300)),
+        'Platform': (game.Platform, lambda cls, i: cls(i % 800, 400, 100, 20)),
+        'Button': (game.Button, lambda cls, i: cls(Rect(0, 0, 300, 60), 'Start', None)),
+    }
+
+
+def measure(cls, build, n):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    objs = [build(cls, i) for i in range(n)]
+    created = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # leitura e escrita de um atributo em todas as instâncias
+    start = time.perf_counter()
+    for _ in range(10):
+        for obj in objs:
+            obj.rect = obj.rect
+    access = time.perf_counter() - start
+    return size / n, created, access
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000])
+    args = parser.parse_args(argv)
+
+    game = headless.load_game()
+    print(f"{'classe':<10}{'n':>8}{'bytes/obj':>18}{'criar (s)':>20}{'acesso (s)':>20}")
+    for name, (cls, build) in factories(game).items():
+        plain = without_slots(cls)
+        for n in args.sizes:
+            before = measure(plain, build, n)
+            after = measure(cls, build, n)
+            print(f"{name:<10}{n:>8}"
+                  f"{before[0]:>9.0f} ->{after[0]:>6.0f}"
+                  f"{before[1]:>11.3f} ->{after[1]:>6.3f}"
+                  f"{before[2]:>11.3f} ->{after[2]:>6.3f}")
+
+
+if __name__ == '__main__':
+    main()
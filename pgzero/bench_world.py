@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark reproduzível do passo do mundo do game2.py.
+
+Monta mundos sintéticos com as classes Hero, Enemy e Platform do game2.py
+(metade plataformas, metade inimigos) em tamanhos crescentes e mede, sem
+janela e com semente fixa:
+
+- update: um quadro de game2.update(dt), com o herói correndo e pulando;
+- query: uma consulta de colisão (grade espacial + colliderect) de um
+  retângulo do tamanho do herói contra plataformas e inimigos;
+- reset: um reset_level(), que devolve o mundo ao estado inicial.
+
+O resultado vai para um JSON, para comparar execuções antes e depois de
+uma mudança.
+
+Uso:
+    python bench_world.py [--sizes 10 1000 10000 100000] [--seed 1]
+                          [--frames 120] [--out bench_world.json]
+"""
+import gc
+import sys
+import json
+import time
+import random
+import platform as py_platform
+
+from pygame import Rect
+
+import headless
+import level_loader
+from enemy_pool import np
+
+SIZES = [10, 1000, 10000, 100000]
+
+
+class SyntheticWorld:
+    """Stand-in for chunks.ChunkedLevel: one chunk, always loaded"""
+    def __init__(self, level):
+        self.name = 'synthetic'
+        self.width = level.width
+        self.height = level.height
+        self.hero = level.hero
+        self.level = level
+        self.loaded = {}
+        self.generation = 0
+
+    def stream(self, view, load_chunk, evict_chunk):
+        if not self.loaded:
+            self.loaded[0] = load_chunk(self.level)
+            self.generation += 1
+
+    def evict_all(self, evict_chunk):
+        for i in sorted(self.loaded):
+            evict_chunk(self.loaded.pop(i))
+            self.generation += 1
+
+
+def synthetic_level(n, rng, height=600):
+    """Level with n entities: a floor, floating platforms and patrols"""
+    n_platforms = max(1, n // 2)
+    n_enemies = n - n_platforms
+    width = max(800, n * 40)
+    floor_y = height - 40
+    platforms = [(x, floor_y, 200, 40) for x in range(0, width, 200)]
+    while len(platforms) < n_platforms:
+        platforms.append((rng.randrange(0, width - 150), rng.randrange(200, floor_y - 80),
+                          rng.randrange(80, 200), 20))
+    platforms = platforms[:n_platforms]
+    enemies = []
+    for _ in range(n_enemies):
+        x1 = rng.randrange(0, width - 250)
+        x2 = x1 + rng.randrange(50, 250)
+        enemies.append((x1, x2, floor_y - 48, x1))
+    return level_loader.LevelData(width, height, (100, floor_y - 200), platforms, enemies)
+
+
+def build(game, n, seed):
+    """Load a synthetic world of n entities into game, as load_level() does"""
+    rng = random.Random(seed)
+    game.world_seed = seed
+    game.world_rng.seed(seed)
+    if game.world is not None:
+        game.world.evict_all(game.evict_chunk)
+    game.world = SyntheticWorld(synthetic_level(n, rng))
+    game.camera.set_world(game.world.width, game.world.height)
+    game.hero = game.Hero(game.world.hero)
+    game.camera.follow(game.hero.rect)
+    game.world.stream(game.camera.view, game.load_chunk, game.evict_chunk)
+    game.level_snapshot = game.save_snapshot()
+    game.physics.reset()
+    game.state = game.STATE_PLAY
+
+
+def bench_update(game, frames, dt=1 / 60):
+    # anda para a direita e pula de vez em quando, como o headless.py
+    script = lambda frame: ('right', 'up') if frame % 90 < 10 else ('right',)
+    start = time.perf_counter()
+    headless.run(game, frames, dt, script)
+    return (time.perf_counter() - start) / frames
+
+
+def bench_query(game, queries, rng):
+    rects = [Rect(rng.randrange(0, game.world.width), rng.randrange(0, game.world.height), 48, 64)
+             for _ in range(queries)]
+    platform_grid, enemy_grid = game.platform_grid, game.enemy_grid
+    hits = 0
+    start = time.perf_counter()
+    for rect in rects:
+        for obj in platform_grid.query(rect):
+            hits += rect.colliderect(obj.rect)
+        for obj in game.enemy_pool.sync(enemy_grid.query(rect)):
+            hits += rect.colliderect(obj.rect)
+    return (time.perf_counter() - start) / queries, hits
+
+
+def bench_reset(game, resets):
+    start = time.perf_counter()
+    for _ in range(resets):
+        game.reset_level()
+    return (time.perf_counter() - start) / resets
+
+
+def run(sizes=SIZES, seed=1, frames=120, queries=2000, resets=20):
+    game = headless.load_game()
+    results = []
+    for n in sizes:
+        gc.collect()
+        start = time.perf_counter()
+        build(game, n, seed)
+        built = time.perf_counter() - start
+        update = bench_update(game, frames)
+        query, hits = bench_query(game, queries, random.Random(seed))
+        reset = bench_reset(game, resets)
+        results.append({
+            'entities': n,
+            'platforms': len(game.platforms),
+            'enemies': len(game.enemies),
+            'build_s': built,
+            'update_us': update * 1e6,
+            'query_us': query * 1e6,
+            'query_hits': hits,
+            'reset_us': reset * 1e6,
+        })
+    return {
+        'seed': seed,
+        'frames': frames,
+        'queries': queries,
+        'resets': resets,
+        'python': sys.version.split()[0],
+        'platform': py_platform.platform(),
+        'numpy': np.__version__ if np is not None else None,
+        'results': results,
+    }
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--frames', type=int, default=120)
+    parser.add_argument('--out', default='bench_world.json')
+    args = parser.parse_args(argv)
+
+    report = run(args.sizes, args.seed, args.frames)
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=1)
+    print(f"{'n':>8}{'montar (s)':>12}{'update (us)':>14}{'query (us)':>13}{'reset (us)':>13}")
+    for r in report['results']:
+        print(f"{r['entities']:>8}{r['build_s']:>12.3f}{r['update_us']:>14.1f}"
+              f"{r['query_us']:>13.2f}{r['reset_us']:>13.1f}")
+    print(f"resultado em {args.out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""
+Mundo maior que a tela, dividido em pedaços (chunks) carregados sob demanda.
+
+A fase é cortada em faixas verticais de largura fixa. Cada faixa é gravada
+num arquivo .lvl próprio (mesmo formato do level_loader.py) dentro da pasta
+levels/<fase>.chunks/, junto com um meta.bin (cabeçalho próprio, não é uma
+fase) com o tamanho do mundo, o início do herói e a divisão em faixas.
+Durante o jogo só ficam na memória as faixas perto da câmera; as que ficam
+longe são descartadas e lidas de novo do disco quando a câmera voltar.
+Assim a memória e o custo por quadro não crescem com o tamanho da fase.
+
+Só o game2.py usa o mundo em faixas. A fase do game1.py (levels/game1.json)
+cabe numa tela só, com quatro plataformas, e não teria o que descarregar; o
+game.py monta a fase no código e nem chega a abrir (STATE_MENU fica dentro
+do comentário "# Game states" e não é definido).
+"""
+import os
+import struct
+
+from pygame import Rect
+
+import level_loader
+
+CHUNK_WIDTH = 800  # largura de cada faixa, em pixels
+KEEP_RADIUS = 1  # faixas mantidas de cada lado da área visível
+
+META_FILE = 'meta.bin'
+META_MAGIC = b'CHK1'
+# magic, largura, altura, herói x, herói y, largura da faixa, nº de faixas
+META = struct.Struct('<4s6i')
+
+
+class Camera:
+    """Top-left corner of the visible area, kept inside the world"""
+    def __init__(self, view_w, view_h):
+        self.view_w = view_w
+        self.view_h = view_h
+        self.world_w = view_w
+        self.world_h = view_h
+        self.x = 0
+        self.y = 0
+
+    def set_world(self, world_w, world_h):
+        self.world_w = world_w
+        self.world_h = world_h
+
+    def follow(self, rect):
+        """Center the view on rect without showing past the world edges"""
+        x = rect.centerx - self.view_w // 2
+        y = rect.centery - self.view_h // 2
+        self.x = max(0, min(x, self.world_w - self.view_w))
+        self.y = max(0, min(y, self.world_h - self.view_h))
+
+    @property
+    def view(self):
+        return Rect(self.x, self.y, self.view_w, self.view_h)
+
+    def visible(self, grid, margin=0, sync=None):
+        """Objects of a SpatialHash whose rect is inside the view, plus a
+        margin for sprites larger than their rect; sync(objects) brings
+        their rects up to date first"""
+        view = self.view.inflate(2 * margin, 2 * margin)
+        found = grid.query(view)
+        if sync is not None:
+            sync(found)
+        return [obj for obj in found if view.colliderect(obj.rect)]
+
+
+def chunk_dir(name):
+    return os.path.join(level_loader.LEVELS_DIR, name + '.chunks')
+
+
+def split_level(name, chunk_width=CHUNK_WIDTH):
+    """Cut levels/<name>.json into one .lvl file per chunk"""
+    level = level_loader.parse_json(os.path.join(level_loader.LEVELS_DIR, name + '.json'))
+    count = max(1, -(-level.width // chunk_width))
+    pieces = [([], []) for _ in range(count)]
+
+    def index(x):
+        return max(0, min(count - 1, x // chunk_width))
+
+    # plataformas que cruzam a divisa são cortadas, uma parte em cada faixa
+    for x, y, w, h in level.platforms:
+        first, last = index(x), index(x + w - 1)
+        for i in range(first, last + 1):
+            left = x if i == first else i * chunk_width
+            right = x + w if i == last else (i + 1) * chunk_width
+            pieces[i][0].append((left, y, right - left, h))
+    # o inimigo pertence à faixa onde começa a patrulha
+    for enemy in level.enemies:
+        pieces[index(enemy[3])][1].append(enemy)
+
+    folder = chunk_dir(name)
+    os.makedirs(folder, exist_ok=True)
+    for i, (platforms, enemies) in enumerate(pieces):
+        chunk = level_loader.LevelData(level.width, level.height, level.hero,
+                                       platforms, enemies)
+        level_loader.write_binary(chunk, os.path.join(folder, f'{i}.lvl'))
+    # gravado por último: só existe quando todas as faixas já estão prontas
+    write_meta(os.path.join(folder, META_FILE), level, chunk_width, count)
+
+
+def write_meta(path, level, chunk_width, count):
+    """Save the world size, hero spawn and chunk layout of a split level"""
+    with open(path, 'wb') as f:
+        f.write(META.pack(META_MAGIC, level.width, level.height,
+                          level.hero[0], level.hero[1], chunk_width, count))
+
+
+def read_meta(path):
+    """(width, height, hero, chunk_width, count) saved by write_meta()"""
+    with open(path, 'rb') as f:
+        data = f.read(META.size)
+    magic, width, height, hx, hy, chunk_width, count = META.unpack(data)
+    if magic != META_MAGIC:
+        raise ValueError(f"{path} is not a chunk index")
+    return width, height, (hx, hy), chunk_width, count
+
+
+class ChunkedLevel:
+    """Keeps only the chunks near the camera in memory.
+
+    The game passes two functions to stream(): load_chunk(LevelData) builds
+    the objects of a chunk and returns them, evict_chunk(objects) throws
+    them away.
+    """
+    def __init__(self, name, keep_radius=KEEP_RADIUS):
+        folder = chunk_dir(name)
+        meta_path = os.path.join(folder, META_FILE)
+        json_path = os.path.join(level_loader.LEVELS_DIR, name + '.json')
+        if (not os.path.exists(meta_path)
+                or os.path.getmtime(meta_path) < os.path.getmtime(json_path)):
+            split_level(name)
+        self.name = name
+        self.folder = folder
+        (self.width, self.height, self.hero,
+         self.chunk_width, self.count) = read_meta(meta_path)
+        self.keep_radius = keep_radius
+        self.loaded = {}
+        # muda toda vez que uma faixa entra ou sai da memória
+        self.generation = 0
+
+    def wanted(self, view):
+        margin = self.chunk_width * self.keep_radius
+        first = max(0, (view.left - margin) // self.chunk_width)
+        last = min(self.count - 1, (view.right - 1 + margin) // self.chunk_width)
+        return range(first, last + 1)
+
+    def stream(self, view, load_chunk, evict_chunk):
+        """Load the chunks near view and evict the ones far from it"""
+        wanted = self.wanted(view)
+        loaded = self.loaded
+        if len(loaded) == len(wanted) and wanted[0] in loaded and wanted[-1] in loaded:
+            return
+        for i in sorted(loaded):
+            if i not in wanted:
+                evict_chunk(loaded.pop(i))
+                self.generation += 1
+        for i in wanted:
+            if i not in loaded:
+                data = level_loader.read_binary(os.path.join(self.folder, f'{i}.lvl'))
+                loaded[i] = load_chunk(data)
+                self.generation += 1
+
+    def evict_all(self, evict_chunk):
+        for i in sorted(self.loaded):
+            evict_chunk(self.loaded.pop(i))
+            self.generation += 1
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+Redesenho só das regiões que mudaram (dirty rectangles).
+
+Em vez de limpar e redesenhar a tela inteira a cada quadro, cada região da
+tela (placar, tempo, pergunta, cada botão...) guarda o valor que mostrou da
+última vez. No draw() só as regiões cujo valor mudou são apagadas e
+desenhadas de novo; o resto da tela continua como estava.
+
+Apagar uma região pode apagar um pedaço de outra que encosta nela (o texto
+de acerto/erro passa por cima do último botão). Essa outra região é
+esquecida e pending() avisa que o draw() precisa de mais uma passada para
+desenhá-la de novo.
+
+O pgzero continua copiando a tela inteira para o monitor depois de cada
+draw(); o ganho é não apagar e redesenhar o que não mudou.
+"""
+
+_MISSING = object()
+
+
+class DirtyRegions:
+    """Tracks what each screen region shows and which rects were repainted"""
+    def __init__(self, background=(0, 0, 0)):
+        self.background = background
+        self.shown = {}
+        self.rects = {}
+        self.dirty = []
+        self.full = True
+        self.stale = False
+
+    def invalidate(self):
+        """Repaint everything on the next frame"""
+        self.full = True
+
+    def begin(self, screen):
+        self.dirty = []
+        self.stale = False
+        if self.full:
+            screen.fill(self.background)
+            self.shown.clear()
+            self.rects.clear()
+            self.dirty.append(screen.surface.get_rect())
+            self.full = False
+
+    def changed(self, screen, key, value):
+        """True if region key must show value; its old area is cleared"""
+        if self.shown.get(key, _MISSING) == value:
+            return False
+        self.shown[key] = value
+        old = self.rects.pop(key, None)
+        if old is not None:
+            screen.draw.filled_rect(old, self.background)
+            self.dirty.append(old)
+            self._forget_overlapping(old)
+        return True
+
+    def _forget_overlapping(self, area):
+        # as regiões que encostam em area perderam um pedaço ao apagá-la
+        for key, rect in list(self.rects.items()):
+            if rect.colliderect(area):
+                del self.rects[key]
+                del self.shown[key]
+                self.stale = True
+
+    def pending(self):
+        """True once if a clear erased part of another region, which must
+        be drawn again in this same draw()"""
+        stale = self.stale
+        self.stale = False
+        return stale
+
+    def painted(self, key, rect):
+        """Record the area region key now covers"""
+        self.rects[key] = rect
+        self.dirty.append(rect)
@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+"""
+Inimigos guardados como estrutura de arrays (structure of arrays).
+
+Em vez de cada inimigo atualizar os próprios atributos num laço Python, o
+estado de patrulha de todos eles (posição, direção, velocidade, pausa e
+animação) fica em arrays paralelos, e um único passo do NumPy avança todos de
+uma vez. Sem NumPy instalado o mesmo código roda sobre listas comuns.
+
+A 120 passos por segundo quase todo inimigo muda de pixel a cada passo, então
+copiar a posição para o Rect de cada um e mexer na grade espacial custaria
+um laço Python por inimigo. Por isso o pool também guarda as células da
+grade que cada inimigo ocupa (floor(x / célula), calculado de uma vez) e o
+passo só devolve os que trocaram de célula; o Rect dos outros só é
+atualizado por sync(), para quem for de fato lê-lo (a colisão com o herói e
+os inimigos visíveis).
+"""
+import random
+
+try:
+    import numpy as np
+except ImportError:  # o NumPy é opcional
+    np = None
+
+SPEED_RANGE = (80, 150)  # nova velocidade sorteada a cada meia-volta
+PAUSE_RANGE = (0.2, 1.0)  # pausa, em segundos, a cada meia-volta
+# com poucos inimigos o custo fixo de cada chamada do NumPy é maior que o
+# ganho; abaixo deste número o passo roda sobre as listas
+NUMPY_MIN_ENEMIES = 64
+
+# nome do array -> tipo dos elementos no NumPy
+FIELDS = {
+    'x': float,
+    'prev_x': float,
+    'rect_x': int,
+    'left': float,
+    'right': float,
+    'speed': float,
+    'dir': int,
+    'pause_time': float,
+    'time_acc': float,
+    'frame_time': float,
+    'frame_index': int,
+    'n_frames': int,
+    'width': int,
+    'cell0': int,  # primeira e última coluna da grade espacial ocupadas
+    'cell1': int,
+}
+
+
+class EnemyPool:
+    """Patrol state of every enemy of the level, kept in parallel arrays.
+
+    cell_size is the SpatialHash cell size the enemies are indexed in.
+    """
+    def __init__(self, rng=random, cell_size=128):
+        self.rng = rng
+        self.cell_size = cell_size
+        self.enemies = []
+        self.packed = False
+        for name in FIELDS:
+            setattr(self, name, [])
+
+    def __len__(self):
+        return len(self.enemies)
+
+    def _unpack(self):
+        """Switch the columns back to lists so they can grow or shrink"""
+        if self.packed:
+            for name in FIELDS:
+                setattr(self, name, getattr(self, name).tolist())
+            self.packed = False
+
+    def _pack(self):
+        """Turn the columns into NumPy arrays for the batched step"""
+        if (np is not None and not self.packed
+                and len(self.enemies) >= NUMPY_MIN_ENEMIES):
+            for name, kind in FIELDS.items():
+                setattr(self, name, np.array(getattr(self, name), dtype=kind))
+            self.packed = True
+
+    def clear(self):
+        self.packed = False
+        self.enemies = []
+        for name in FIELDS:
+            setattr(self, name, [])
+
+    def add(self, enemy):
+        """Take over the patrol state of an Enemy"""
+        self._unpack()
+        enemy.pool = self
+        enemy.index = len(self.enemies)
+        self.enemies.append(enemy)
+        x = float(enemy.rect.x)
+        width = enemy.rect.width
+        values = {
+            'x': x,
+            'prev_x': x,
+            'rect_x': enemy.rect.x,
+            'left': enemy.bounds[0],
+            'right': enemy.bounds[1],
+            'speed': enemy.base_speed,
+            'dir': 1,
+            'pause_time': 0.0,
+            'time_acc': 0.0,
+            'frame_time': enemy.frame_time,
+            'frame_index': 0,
+            'n_frames': len(enemy.move_frames),
+            'width': width,
+            'cell0': enemy.rect.x // self.cell_size,
+            'cell1': (enemy.rect.x + width - 1) // self.cell_size,
+        }
+        for name in FIELDS:
+            getattr(self, name).append(values[name])
+
+    def remove(self, enemy):
+        """Drop an enemy; the last one takes its slot"""
+        self._unpack()
+        i = enemy.index
+        last = len(self.enemies) - 1
+        for name in FIELDS:
+            column = getattr(self, name)
+            column[i] = column[last]
+            column.pop()
+        moved = self.enemies.pop()
+        if moved is not enemy:
+            self.enemies[i] = moved
+            moved.index = i
+        enemy.pool = enemy.index = None
+
+    def snapshot(self):
+        """Copy of every column, for restore()"""
+        return {name: getattr(self, name).copy() for name in FIELDS}
+
+    def restore(self, saved):
+        """Write a snapshot back into the same columns, without reallocating.
+
+        The pool must hold the same enemies as when the snapshot was taken.
+        Returns the enemies, whose rects have been put back.
+        """
+        for name in FIELDS:
+            getattr(self, name)[:] = saved[name]
+        for e, x in zip(self.enemies, self.rect_x):
+            e.rect.x = int(x)
+        return self.enemies
+
+    def update(self, dt):
+        """Advance every enemy by dt; return the enemies that changed grid
+        cells, with their rect synced. Other rects are left stale: sync()
+        them before reading."""
+        if not self.enemies:
+            return []
+        self._pack()
+        if self.packed:
+            moved = self._update_arrays(dt)
+        else:
+            moved = self._update_lists(dt)
+        enemies = self.enemies
+        return self.sync([enemies[i] for i in moved])
+
+    def sync(self, enemies):
+        """Copy the current x into the rect of each enemy; return them"""
+        rect_x = self.rect_x
+        for e in enemies:
+            e.rect.x = int(rect_x[e.index])
+        return enemies
+
+    def _turn(self, i):
+        # mesma regra do Enemy original: meia-volta, nova velocidade e pausa
+        self.dir[i] = -self.dir[i]
+        self.speed[i] = self.rng.randint(*SPEED_RANGE)
+        self.pause_time[i] = self.rng.uniform(*PAUSE_RANGE)
+
+    def _update_arrays(self, dt):
+        x = self.x
+        self.prev_x[:] = x
+        paused = self.pause_time > 0
+        self.pause_time[paused] -= dt
+        active = ~paused
+
+        x[active] += (self.speed * self.dir)[active] * dt
+        out = active & ((x < self.left) | (x > self.right))
+        for i in np.flatnonzero(out).tolist():
+            self._turn(i)
+
+        acc = self.time_acc
+        acc[active] += dt
+        tick = active & (acc >= self.frame_time)
+        acc[tick] -= self.frame_time[tick]
+        self.frame_index[tick] = (self.frame_index[tick] + 1) % self.n_frames[tick]
+
+        self.rect_x[:] = np.rint(x)
+        size = self.cell_size
+        cell0 = self.rect_x // size
+        cell1 = (self.rect_x + self.width - 1) // size
+        moved = np.flatnonzero((cell0 != self.cell0) | (cell1 != self.cell1))
+        self.cell0[moved] = cell0[moved]
+        self.cell1[moved] = cell1[moved]
+        return moved.tolist()
+
+    def _update_lists(self, dt):
+        moved = []
+        x = self.x
+        for i in range(len(x)):
+            self.prev_x[i] = x[i]
+            if self.pause_time[i] > 0:
+                self.pause_time[i] -= dt
+                continue
+            x[i] += self.speed[i] * self.dir[i] * dt
+            if x[i] < self.left[i] or x[i] > self.right[i]:
+                self._turn(i)
+            self.time_acc[i] += dt
+            if self.time_acc[i] >= self.frame_time[i]:
+                self.time_acc[i] -= self.frame_time[i]
+                self.frame_index[i] = (self.frame_index[i] + 1) % self.n_frames[i]
+            new_x = self.rect_x[i] = round(x[i])
+            cell0 = new_x // self.cell_size
+            cell1 = (new_x + self.width[i] - 1) // self.cell_size
+            if cell0 != self.cell0[i] or cell1 != self.cell1[i]:
+                self.cell0[i] = cell0
+                self.cell1[i] = cell1
+                moved.append(i)
+        return moved
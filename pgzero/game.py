@@ -8,6 +8,9 @@ import random
 import math
 from pygame import Rect
 
+from audio import AudioBank
+from music_manager import MusicManager
+
 #    PgZero constants
 TITLE = "My Platformer Adventure"
 WIDTH = 800
@@ -22,6 +25,12 @@ STATE_QUIT = 2
 state = STATE_MENU
 music_on = True
 
+# efeitos sonoros já decodificados (ver audio.py)
+audio = AudioBank()
+audio.load('hit', 'hit.wav')
+# a música pausa em vez de parar (ver music_manager.py)
+soundtrack = MusicManager(music)
+
 # Menu buttons container
 menu_buttons = []
 
@@ -79,7 +88,7 @@ def start_game():
     state = STATE_PLAY
     load_level()
     if music_on:
-        music.play('bg_music', loop=True)
+        soundtrack.play('bg_music')
 
 
 def toggle_music():
@@ -89,9 +98,9 @@ def toggle_music():
     btn = menu_buttons[1]
     btn.text = f"Music: {'On' if music_on else 'Off'}"
     if music_on:
-        music.play('bg_music', loop=True)
+        soundtrack.play('bg_music')
     else:
-        music.stop()
+        soundtrack.pause()
 
 
 def quit_game():
@@ -234,7 +243,7 @@ def update(dt):
             if hero.rect.colliderect(e.rect):
                 # reset level on collision
                 load_level()
-                sounds.hit.play()
+                audio.play('hit')
                 break
 
 
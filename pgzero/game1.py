@@ -9,8 +9,20 @@ os.environ['SDL_VIDEO_CENTERED']     = '0'
 import pgzrun
 import math
 import random
+from functools import partial
 from pygame import Rect
 
+from timestep import FixedTimestep, lerp
+import level_loader
+import asset_cache
+import snapshot
+from preloader import Preloader
+from asset_store import AssetStore
+from audio import AudioBank
+from music_manager import MusicManager
+from profiler import profiler
+from ui import Menu, Hotspot
+
 # --- Configurações do Jogo ---
 WIDTH = 800
 HEIGHT = 600
@@ -19,6 +31,11 @@ JUMP_POWER = -20
 PLAYER_SPEED = 5
 ENEMY_SPEED = 2
 FPS = 30
+# as velocidades acima são em pixels por passo de física; a física roda
+# sempre a PHYSICS_HZ passos por segundo, seja qual for o FPS da máquina
+PHYSICS_HZ = 60
+MAX_PHYSICS_STEPS = 5
+SCREEN_RECT = Rect(0, 0, WIDTH, HEIGHT)
 
 # --- Recursos ---
 PLAYER_IDLE_RIGHT = ["hero_idle_right_0.png", "hero_idle_right_1.png"]
@@ -32,9 +49,10 @@ MENU_BACKGROUND_IMAGE = "menu_background.png"
 MUSIC = "background_music.mp3"
 JUMP_SOUND = "jump.wav"
 DEATH_SOUND = "Death.mp3"
+LEVEL = "game1"  # fase em levels/game1.json
 
 # --- Estados do Jogo ---
-GAME_STATE = "menu"  # Pode ser "menu", "playing", "game_over"
+GAME_STATE = "loading"  # Pode ser "loading", "menu", "playing", "game_over"
 MUSIC_ENABLED = True
 
 # --- Classes ---
@@ -47,6 +65,7 @@ class Entity(Actor):
         self.animation_speed = animation_speed
         self.frame_index = 0
         self.animation_timer = 0.0
+        self.prev_pos = self.pos
 
     def update_animation(self, dt):
         self.animation_timer += dt
@@ -55,8 +74,23 @@ class Entity(Actor):
             self.frame_index = (self.frame_index + 1) % len(self.frames)
             self.image = self.frames[self.frame_index]
 
+    def remember_position(self):
+        self.prev_pos = self.pos
+
+    def draw_interpolated(self, alpha):
+        """Desenha entre a posição do passo anterior e a atual"""
+        pos = self.pos
+        self.pos = (lerp(self.prev_pos[0], pos[0], alpha),
+                    lerp(self.prev_pos[1], pos[1], alpha))
+        self.draw()
+        self.pos = pos
+
 class Hero(Entity):
     """Classe para o personagem principal."""
+    # atributos que mudam durante o jogo (a imagem antes da posição)
+    SNAPSHOT_FIELDS = ('frames', 'frame_index', 'animation_timer', 'image', 'pos',
+                       'prev_pos', 'vx', 'vy', 'on_ground', 'facing_right')
+
     def __init__(self, pos):
         super().__init__(PLAYER_IDLE_RIGHT[0], pos, PLAYER_IDLE_RIGHT)
         self.vx = 0
@@ -106,7 +140,7 @@ class Hero(Entity):
         if keyboard.space and self.on_ground:
             self.vy = JUMP_POWER
             if MUSIC_ENABLED:
-                sounds.jump.play()
+                audio.play('jump')
 
         self.update_animation(dt)
         if self.vx == 0 and self.on_ground:
@@ -117,10 +151,12 @@ class Hero(Entity):
             self.vy = JUMP_POWER
             self.on_ground = False
             if MUSIC_ENABLED:
-                sounds.jump.play()
+                audio.play('jump')
 
 class Enemy(Entity):
     """Classe para os inimigos."""
+    SNAPSHOT_FIELDS = ('frame_index', 'animation_timer', 'image', 'pos', 'prev_pos', 'vx')
+
     def __init__(self, pos, patrol_area):
         super().__init__(ENEMY_SPRITES[0], pos, ENEMY_SPRITES, animation_speed=0.2)
         self.vx = ENEMY_SPEED
@@ -136,31 +172,93 @@ class Enemy(Entity):
         self.update_animation(dt)
 
 # --- Objetos do Jogo ---
-hero = Hero((50, HEIGHT - 150))
-platforms = [
-    Actor(PLATFORM_IMAGE, (100, HEIGHT - 20)),
-    Actor(PLATFORM_IMAGE, (300, HEIGHT - 100)),
-    Actor(PLATFORM_IMAGE, (500, HEIGHT - 50)),
-    Actor(PLATFORM_IMAGE, (700, HEIGHT - 150))
-]
-enemies = [
-    Enemy((200, HEIGHT - 40), (150, 250)),
-    Enemy((600, HEIGHT - 70), (550, 650))
-]
-background = Actor(BACKGROUND_IMAGE, (WIDTH // 2, HEIGHT // 2))
-menu_background = Actor(MENU_BACKGROUND_IMAGE, (WIDTH // 2, HEIGHT // 2))
+def spawn_enemies(level):
+    """Cria os inimigos da fase nas posições iniciais"""
+    return [Enemy((start, y), (x1, x2)) for x1, x2, y, start in level.enemies]
+
+def build_world():
+    """Cria herói, plataformas e inimigos (depois que os sprites carregaram)"""
+    global level, hero, platforms, enemies, start_snapshot
+    level = level_loader.load(LEVEL)
+    hero = Hero(level.hero)
+    platforms = [Actor(PLATFORM_IMAGE, topleft=(x, y)) for x, y, w, h in level.platforms]
+    enemies = spawn_enemies(level)
+    # estado inicial, usado para reiniciar sem recriar os objetos
+    start_snapshot = (
+        snapshot.capture(hero, Hero.SNAPSHOT_FIELDS),
+        snapshot.capture_all(enemies, Enemy.SNAPSHOT_FIELDS),
+    )
+
+# criados por build_world() quando o carregamento termina
+level = None
+hero = None
+platforms = []
+enemies = []
+start_snapshot = None
+physics = FixedTimestep(1 / PHYSICS_HZ, MAX_PHYSICS_STEPS)
+# objetos desenhados e descartados (fora da tela) no último quadro
+draw_stats = {'drawn': 0, 'culled': 0}
+
+# --- Carregamento em segundo plano ---
+def cache_sprites(names, surf):
+    """Guarda o sprite no cache de imagens do pgzero, onde o Actor o procura,
+    sob todos os nomes que têm o mesmo conteúdo"""
+    surf = asset_cache.prepare(surf, alpha=True)
+    for name in names:
+        images.cache[images.cache_key(name, (), {})] = surf
+    return surf
+
+def preload_background(name):
+    # fundos já no tamanho da janela e no formato de pixel da tela
+    size = (WIDTH, HEIGHT)
+    preloader.add(name, partial(asset_cache.load_background, name, size),
+                  partial(asset_cache.background, name, size))
+
+# nomes usados no código -> conteúdo de cada arquivo (ver asset_store.py)
+assets = AssetStore()
+preloader = Preloader()
+# efeitos sonoros decodificados no carregamento, não no primeiro play()
+audio = AudioBank(assets)
+# a música pausa em vez de parar e continua de onde estava
+soundtrack = MusicManager(music)
+# primeiro o que o menu usa, para ele aparecer logo
+preload_background(MENU_BACKGROUND_IMAGE)
+preload_background(BACKGROUND_IMAGE)
+# arquivos iguais (os quatro quadros do herói para a esquerda) são lidos uma vez
+sprite_names = (PLAYER_IDLE_RIGHT + PLAYER_RUN_RIGHT + PLAYER_IDLE_LEFT
+                + PLAYER_RUN_LEFT + ENEMY_SPRITES + [PLATFORM_IMAGE])
+for names in assets.group('images', dict.fromkeys(sprite_names)).values():
+    preloader.add(names[0], partial(asset_cache.load_image, names[0]),
+                  partial(cache_sprites, names))
+for key, filename in (('jump', JUMP_SOUND), ('death', DEATH_SOUND)):
+    preloader.add(key, partial(audio.decode, filename), partial(audio.add, key))
+preloader.start()
 
 # --- Botões do Menu ---
 start_button_rect = Rect(WIDTH // 2 - 100, 200, 200, 50)
 music_button_rect = Rect(WIDTH // 2 - 100, 270, 200, 50)
 exit_button_rect = Rect(WIDTH // 2 - 100, 340, 200, 50)
 
+def draw_progress():
+    bar = Rect(WIDTH // 2 - 150, HEIGHT - 80, 300, 20)
+    screen.draw.rect(bar, "white")
+    screen.draw.filled_rect(Rect(bar.x, bar.y, round(bar.w * preloader.progress), bar.h), "white")
+
 def draw():
-    if GAME_STATE == "menu":
-        menu_background.draw()
+    # menu parado e tudo carregado: a tela do quadro anterior continua valendo
+    if (GAME_STATE == "menu" and preloader.done and not menu.redraw()
+            and not profiler.enabled):
+        return
+    if GAME_STATE == "loading":
+        screen.fill("black")
+        screen.draw.text("Carregando...", center=(WIDTH // 2, HEIGHT // 2), fontsize=48, color="white")
+        draw_progress()
+    elif GAME_STATE == "menu":
+        screen.blit(preloader[MENU_BACKGROUND_IMAGE], (0, 0))
         screen.draw.text("Game Platformer X", center=(WIDTH // 2, 90), fontsize=48, color="white", ocolor='black')
         screen.draw.rect(start_button_rect, (100, 100, 100))
-        screen.draw.text("Comecar Jogo", center=start_button_rect.center, fontsize=24, color="white", ocolor='black')
+        start_text = "Comecar Jogo" if preloader.done else f"Carregando {preloader.progress:.0%}"
+        screen.draw.text(start_text, center=start_button_rect.center, fontsize=24, color="white", ocolor='black')
         screen.draw.rect(music_button_rect, (100, 100, 100))
         music_text = "Musica ON" if MUSIC_ENABLED else "Musica OFF"
         screen.draw.text(music_text, center=music_button_rect.center, fontsize=24, color="white", ocolor='black')
@@ -168,13 +266,26 @@ def draw():
         screen.draw.text("Sair", center=exit_button_rect.center, fontsize=24, color="white", ocolor='black')
  
     elif GAME_STATE == "playing":
-        background.draw()
-        for platform in platforms:
-            platform.draw()
-        hero.draw()
-        for enemy in enemies:
-            enemy.draw()
-        screen.draw.text("Pressione a Tecla ALT pra pular", center=(WIDTH // 2, 100), fontsize=48, color="white", ocolor='black')
+        with profiler.section('background'):
+            screen.blit(preloader[BACKGROUND_IMAGE], (0, 0))
+        drawn = 0
+        # só desenha o que aparece na tela
+        with profiler.section('platform draw'):
+            for platform in platforms:
+                if platform.colliderect(SCREEN_RECT):
+                    platform.draw()
+                    drawn += 1
+        with profiler.section('sprite draw'):
+            hero.draw_interpolated(physics.alpha)
+            drawn += 1
+            for enemy in enemies:
+                if enemy.colliderect(SCREEN_RECT):
+                    enemy.draw_interpolated(physics.alpha)
+                    drawn += 1
+        draw_stats['drawn'] = drawn
+        draw_stats['culled'] = len(platforms) + len(enemies) + 1 - drawn
+        with profiler.section('text'):
+            screen.draw.text("Pressione a Tecla ALT pra pular", center=(WIDTH // 2, 100), fontsize=48, color="white", ocolor='black')
     elif GAME_STATE == "game_over":
         screen.fill("black")
         screen.draw.text("Game Over", center=(WIDTH // 2, HEIGHT // 2 - 30), fontsize=48, color="red")
@@ -182,44 +293,79 @@ def draw():
 
 def update(dt):
     global GAME_STATE
+    if not preloader.done:
+        preloader.poll()
+        if GAME_STATE == "loading" and preloader.ready(MENU_BACKGROUND_IMAGE):
+            GAME_STATE = "menu"
+        if preloader.done:
+            build_world()
+            menu.invalidate()  # o botão deixa de mostrar o progresso
     if GAME_STATE == "playing":
+        physics.advance(dt, step_game)
+
+def step_game(dt):
+    """Avança o jogo um passo fixo de física"""
+    global GAME_STATE
+    if GAME_STATE != "playing":
+        return
+    with profiler.section('hero'):
+        hero.remember_position()
         hero.update(dt, platforms)
+    with profiler.section('enemies'):
         for enemy in enemies:
+            enemy.remember_position()
             enemy.update(dt)
-            if hero.colliderect(enemy):
-                GAME_STATE = "game_over"
-                if MUSIC_ENABLED:
-                    sounds.death.play()
-                    music.stop()
+    with profiler.section('collisions'):
+        hit = any(hero.colliderect(enemy) for enemy in enemies)
+    if hit:
+        GAME_STATE = "game_over"
+        if MUSIC_ENABLED:
+            audio.play('death')
+            soundtrack.pause()
+
+def start_game():
+    global GAME_STATE
+    if hero is None:
+        return  # ainda carregando
+    GAME_STATE = "playing"
+    if MUSIC_ENABLED:
+        soundtrack.play(MUSIC)
+
+def toggle_music():
+    global MUSIC_ENABLED
+    MUSIC_ENABLED = not MUSIC_ENABLED
+    menu.invalidate()
+    if MUSIC_ENABLED:
+        soundtrack.play(MUSIC)
+    else:
+        soundtrack.pause()
+
+# cliques do menu achados pela grade de botões (ver ui.py)
+menu = Menu()
+menu.add(Hotspot(start_button_rect, start_game))
+menu.add(Hotspot(music_button_rect, toggle_music))
+menu.add(Hotspot(exit_button_rect, quit))
 
 def on_mouse_down(pos):
-    global GAME_STATE, MUSIC_ENABLED
     if GAME_STATE == "menu":
-        if start_button_rect.collidepoint(pos):
-            GAME_STATE = "playing"
-            if MUSIC_ENABLED:
-                music.play(MUSIC)
-        elif music_button_rect.collidepoint(pos):
-            MUSIC_ENABLED = not MUSIC_ENABLED
-            if MUSIC_ENABLED:
-                music.play(MUSIC)
-            else:
-                music.stop()
-        elif exit_button_rect.collidepoint(pos):
-            quit()
+        menu.on_mouse_down(pos)
     elif GAME_STATE == "game_over":
         pass # Adicionar lógica de reinício se pressionar espaço na função update
 
 def on_key_down(key):
-    global GAME_STATE, hero, enemies
+    global GAME_STATE
     if GAME_STATE == "game_over" and key == keys.SPACE:
         GAME_STATE = "playing"
-        hero = Hero((100, HEIGHT - 50))
-        enemies = [
-            Enemy((200, HEIGHT - 40), (150, 250)),
-            Enemy((600, HEIGHT - 70), (550, 650))
-        ]
+        hero_state, enemy_states = start_snapshot
+        snapshot.restore(hero, Hero.SNAPSHOT_FIELDS, hero_state)
+        snapshot.restore_all(enemies, Enemy.SNAPSHOT_FIELDS, enemy_states)
+        physics.reset()
         if MUSIC_ENABLED:
-            music.play(MUSIC)
+            soundtrack.play(MUSIC)
+
+# com PROFILE=1, mede cada quadro e mostra o painel (ver profiler.py)
+update = profiler.wrap_update(update)
+draw = profiler.wrap_draw(draw, lambda: screen)
+profiler.dump_at_exit()
 
 pgzrun.go()
\ No newline at end of file
@@ -46,18 +46,37 @@ import random
 import math
 from pygame import Rect
 
+from spatial import SpatialHash
+from timestep import FixedTimestep, lerp
+from collision import time_of_impact, swept_rect
+from enemy_pool import EnemyPool
+import snapshot
+from chunks import Camera, ChunkedLevel
+from text_cache import TextCache
+from atlas import Atlas, HERO_BOX
+from animation import Animation
+from music_manager import MusicManager
+from profiler import profiler
+from replay import InputRecorder
+from ui import Menu
+
 # PgZero constants
 TITLE = "My Platformer Adventure"
 WIDTH = 800
 HEIGHT = 600
 
 gravity = 1200  # pixels per second squared
+LEVEL = "level1"  # fase em levels/level1.json (levels/level2.json é uma fase longa)
+GRID_CELL = 128  # tamanho da célula da grade espacial, em pixels
+PHYSICS_HZ = 120  # passos de física por segundo, independente do FPS
+MAX_PHYSICS_STEPS = 8  # limite de passos atrasados recuperados por quadro
+CULL_MARGIN = 64  # folga da área visível, para sprites maiores que o rect
+SHOW_DRAW_STATS = False  # mostra na tela quantos objetos foram desenhados
+SEED = None  # semente do mundo; None sorteia uma nova a cada execução
 
 # --- Recursos ---
 PLAYER_IDLE_RIGHT = ["hero_idle_right_0.png", "hero_idle_right_1.png"]
 PLAYER_RUN_RIGHT = ["hero_run_right_0.png", "hero_run_right_1.png"]
-PLAYER_IDLE_LEFT = ["hero_idle_left_0.png", "hero_idle_left_1.png"]
-PLAYER_RUN_LEFT = ["hero_run_left_0.png", "hero_run_left_1.png"]
 ENEMY_SPRITES = ["enemy_idle_0.png", "enemy_idle_1.png"]
 PLATFORM_IMAGE = "platform.png"
 BACKGROUND_IMAGE = "background.png"
@@ -77,14 +96,20 @@ STATE_QUIT = 2
 
 state = STATE_MENU
 music_on = True
+# a música pausa em vez de parar e continua de onde estava
+soundtrack = MusicManager(music)
 
 # Menu buttons container
 menu_buttons = []
-# Mouse position tracker
-mouse_pos = (0, 0)
+# destaque e cliques dos botões, recalculados só nos eventos do mouse
+menu = Menu()
+# textos já rasterizados, reaproveitados de um quadro para o outro
+text_cache = TextCache()
 
 class Button:
     """Simple clickable button"""
+    __slots__ = ('rect', 'text', 'callback', 'hover')
+
     def __init__(self, rect, text, callback):
         self.rect = rect
         self.text = text
@@ -94,7 +119,8 @@ class Button:
     def draw(self):
         color = 'lightskyblue' if self.hover else 'dodgerblue'
         screen.draw.filled_rect(self.rect, color)
-        screen.draw.text(
+        text_cache.draw(
+            screen,
             self.text,
             center=self.rect.center,
             fontsize=40,
@@ -103,17 +129,12 @@ class Button:
             ocolor='black'
         )
 
-    def check_click(self, pos):
-        if self.rect.collidepoint(pos):
-            self.callback()
-
-    def check_hover(self, pos):
-        self.hover = self.rect.collidepoint(pos)
 
 
 def init_menu():
     """Create menu buttons"""
     menu_buttons.clear()
+    menu.clear()
     btn_w, btn_h = 300, 60
     x = (WIDTH - btn_w) // 2
     y0 = 200
@@ -136,15 +157,20 @@ def init_menu():
         'Quit',
         quit_game
     ))
+    for btn in menu_buttons:
+        menu.add(btn)
 
 
 def start_game():
     """Switch to play state and initialize level"""
-    global state
+    global state, deaths
     state = STATE_PLAY
+    deaths = 0
     load_level()
+    if recorder is not None:
+        recorder.start(world_seed, LEVEL, physics.step)
     if music_on:
-        music.play(MUSIC)
+        soundtrack.play(MUSIC)
 
 
 def toggle_music():
@@ -153,10 +179,11 @@ def toggle_music():
     music_on = not music_on
     btn = menu_buttons[1]
     btn.text = f"Music: {'On' if music_on else 'Off'}"
+    menu.invalidate()
     if music_on:
-        music.play(MUSIC)
+        soundtrack.play(MUSIC)
     else:
-        music.stop()
+        soundtrack.pause()
 
 
 def quit_game():
@@ -167,162 +194,322 @@ def quit_game():
 enemies = []
 platforms = []
 hero = None
+world = None  # fase dividida em faixas; só as perto da câmera ficam carregadas
+camera = Camera(WIDTH, HEIGHT)
+level_snapshot = None  # estado do mundo logo depois de montar a fase
+deaths = 0  # mortes desde o início da partida
+# objetos desenhados e descartados (fora da câmera) no último quadro
+draw_stats = {'drawn': 0, 'culled': 0}
+# grades espaciais: só as células perto do herói são consultadas
+platform_grid = SpatialHash(GRID_CELL)
+enemy_grid = SpatialHash(GRID_CELL)
+physics = FixedTimestep(1 / PHYSICS_HZ, MAX_PHYSICS_STEPS)
+# tudo que o mundo sorteia sai deste gerador: com a mesma semente e as
+# mesmas teclas a partida se repete igual (ver replay.py)
+world_seed = SEED if SEED is not None else random.randrange(2 ** 32)
+world_rng = random.Random(world_seed)
+# estado de patrulha de todos os inimigos, atualizado num passo só
+enemy_pool = EnemyPool(world_rng, GRID_CELL)
+# com RECORD=arquivo.json, grava as teclas de cada passo da partida
+recorder = InputRecorder.from_env()
+# todos os quadros de animação numa folha só (ver atlas.py)
+sprites = Atlas.load()
 
 class Hero:
+    # __slots__: sem __dict__ por instância, menos memória e acesso mais rápido
+    __slots__ = ('frame_index', 'time_acc', 'current_image', 'rect', 'x', 'y',
+                 'prev_x', 'prev_y', 'vx', 'vy', 'on_ground', 'facing')
+    # iguais para todos os heróis, então ficam na classe
+    # quadros para a direita; os da esquerda são espelhados (ver animation.py)
+    idle_frames = Animation(sprites.frames(PLAYER_IDLE_RIGHT), HERO_BOX[0])
+    run_frames = Animation(sprites.frames(PLAYER_RUN_RIGHT), HERO_BOX[0])
+    frame_time = 0.1
+    # o que muda durante o jogo; o rect é refeito a partir de x e y
+    SNAPSHOT_FIELDS = ('frame_index', 'time_acc', 'current_image', 'x', 'y',
+                       'prev_x', 'prev_y', 'vx', 'vy', 'on_ground', 'facing')
+
     def __init__(self, pos):
-        self.idle_frames = PLAYER_IDLE_RIGHT
-        self.run_frames = PLAYER_RUN_RIGHT
         self.frame_index = 0
-        self.frame_time = 0.1
         self.time_acc = 0.0
+        self.current_image = self.idle_frames.frame(0)
 
         self.rect = Rect(pos[0], pos[1], 48, 64)
-        self.vel = [0, 0]
+        # posição em float (o Rect só guarda inteiros) e a do passo anterior,
+        # usada para interpolar o desenho
+        self.x, self.y = float(self.rect.x), float(self.rect.y)
+        self.prev_x, self.prev_y = self.x, self.y
+        self.vx = 0
+        self.vy = 0
         self.on_ground = False
         self.facing = 'right'
 
     def update(self, dt):
-        self.vel[0] = 0
+        self.prev_x, self.prev_y = self.x, self.y
+        self.vx = 0
         if keyboard.left:
-            self.vel[0] = -200
+            self.vx = -200
             self.facing = 'left'
         elif keyboard.right:
-            self.vel[0] = 200
+            self.vx = 200
             self.facing = 'right'
         if keyboard.up and self.on_ground:
-            self.vel[1] = -500
+            self.vy = -500
 
-        self.vel[1] += gravity * dt
+        self.vy += gravity * dt
 
-        self.rect.x += self.vel[0] * dt
-        self.check_collision('horizontal')
-        self.rect.y += self.vel[1] * dt
-        self.check_collision('vertical')
+        self.sweep(self.vx * dt, 0)
+        self.on_ground = False
+        if self.sweep(0, self.vy * dt) is not None:
+            if self.vy > 0:
+                self.on_ground = True
+            self.vy = 0
+        self.rect.topleft = (round(self.x), round(self.y))
 
-        frames = self.run_frames if self.vel[0] != 0 else self.idle_frames
+        frames = self.run_frames if self.vx != 0 else self.idle_frames
         self.time_acc += dt
         if self.time_acc >= self.frame_time:
             self.time_acc -= self.frame_time
             self.frame_index = (self.frame_index + 1) % len(frames)
 
-        self.current_image = frames[self.frame_index]
-
-    def check_collision(self, direction):
-        for plat in platforms:
-            if self.rect.colliderect(plat.rect):
-                if direction == 'horizontal':
-                    if self.vel[0] > 0:
-                        self.rect.right = plat.rect.left
-                    elif self.vel[0] < 0:
-                        self.rect.left = plat.rect.right
-                else:
-                    if self.vel[1] > 0:
-                        self.rect.bottom = plat.rect.top
-                        self.vel[1] = 0
-                        self.on_ground = True
-                    elif self.vel[1] < 0:
-                        self.rect.top = plat.rect.bottom
-                        self.vel[1] = 0
-        if direction == 'vertical' and self.vel[1] != 0:
-            self.on_ground = False
-
-    def draw(self):
-        screen.blit(self.current_image, (self.rect.x, self.rect.y))
+        self.current_image = frames.frame(self.frame_index, self.facing)
+
+    def sweep(self, dx, dy):
+        """Move by (dx, dy) along one axis, stopping at the first platform
+        in the way; return that platform or None"""
+        w, h = self.rect.size
+        first, hit = 1.0, None
+        for plat in platform_grid.query(swept_rect(self.x, self.y, w, h, dx, dy)):
+            t = time_of_impact(self.x, self.y, w, h, dx, dy, plat.rect)
+            if t is not None and (hit is None or t < first):
+                first, hit = t, plat
+        if hit is None:
+            self.x += dx
+            self.y += dy
+        elif dx > 0:
+            self.x = hit.rect.left - w
+        elif dx < 0:
+            self.x = hit.rect.right
+        elif dy > 0:
+            self.y = hit.rect.top - h
+        elif dy < 0:
+            self.y = hit.rect.bottom
+        return hit
+
+    def draw_rect(self, alpha=1.0):
+        """rect at the position interpolated between the last two steps"""
+        x = lerp(self.prev_x, self.x, alpha)
+        y = lerp(self.prev_y, self.y, alpha)
+        return Rect(round(x), round(y), self.rect.width, self.rect.height)
+
+    def draw(self, alpha=1.0):
+        x, y = self.draw_rect(alpha).topleft
+        # quadro recortado e seu deslocamento dentro do rect (ver atlas.py)
+        image, (dx, dy) = self.current_image
+        screen.blit(image, (x + dx - camera.x, y + dy - camera.y))
 
 class Enemy:
-    def __init__(self, x1, x2, y):
-        self.move_frames = ENEMY_SPRITES
-        self.idle_frames = ENEMY_SPRITES
-        self.frame_index = 0
-        self.frame_time = 0.2
-        self.time_acc = 0.0
-
-        self.rect = Rect(x1, y, 48, 48)
+    """Enemy handle; its patrol state lives in enemy_pool (see enemy_pool.py)"""
+    __slots__ = ('rect', 'bounds', 'base_speed', 'pool', 'index')
+    move_frames = sprites.frames(ENEMY_SPRITES)
+    idle_frames = move_frames
+    frame_time = 0.2
+
+    def __init__(self, x1, x2, y, start=None):
+        # patrulha entre x1 e x2, começando em start (por padrão, em x1)
+        self.rect = Rect(x1 if start is None else start, y, 48, 48)
         self.bounds = (x1, x2)
-        self.base_speed = random.randint(80, 120)
-        self.speed = self.base_speed
-        self.dir = 1
-        self.pause_time = 0
-        self.pause_duration = 0
+        self.base_speed = world_rng.randint(80, 120)
+        # preenchidos pelo EnemyPool.add()
+        self.pool = None
+        self.index = None
 
-    def update(self, dt):
-        if self.pause_time > 0:
-            self.pause_time -= dt
-            return
-
-        self.rect.x += self.speed * self.dir * dt
-        if self.rect.x < self.bounds[0] or self.rect.x > self.bounds[1]:
-            self.dir *= -1
-            self.speed = random.randint(80, 150)
-            self.pause_duration = random.uniform(0.2, 1.0)
-            self.pause_time = self.pause_duration
-
-        frames = self.move_frames if self.dir != 0 else self.idle_frames
-        self.time_acc += dt
-        if self.time_acc >= self.frame_time:
-            self.time_acc -= self.frame_time
-            self.frame_index = (self.frame_index + 1) % len(frames)
-        self.current_image = frames[self.frame_index]
-
-    def draw(self):
-        screen.blit(self.current_image, (self.rect.x, self.rect.y))
+    def draw(self, alpha=1.0):
+        pool, i = self.pool, self.index
+        x = lerp(pool.prev_x[i], pool.x[i], alpha)
+        image, (dx, dy) = self.move_frames[pool.frame_index[i]]
+        screen.blit(image, (round(x) + dx - camera.x, self.rect.y + dy - camera.y))
 
 class Platform:
+    __slots__ = ('rect',)
+
     def __init__(self, x, y, w, h):
         self.rect = Rect(x, y, w, h)
 
     def draw(self):
-        screen.draw.filled_rect(self.rect, 'sienna')
+        screen.draw.filled_rect(self.rect.move(-camera.x, -camera.y), 'sienna')
 
 
 def load_level():
-    global hero, enemies, platforms
-    platforms.clear()
-    enemies.clear()
-    platforms.append(Platform(0, HEIGHT - 40, WIDTH, 40))
-    platforms.append(Platform(150, 450, 200, 20))
-    platforms.append(Platform(450, 350, 200, 20))
-    hero = Hero((100, HEIGHT - 100))
-    enemies.append(Enemy(160, 330, 410))
-    enemies.append(Enemy(460, 630, 310))
+    """Start the level with only the chunks around the hero loaded"""
+    global hero, world, level_snapshot
+    world_rng.seed(world_seed)
+    if world is None or world.name != LEVEL:
+        if world is not None:
+            world.evict_all(evict_chunk)
+        world = ChunkedLevel(LEVEL)
+        camera.set_world(world.width, world.height)
+    world.evict_all(evict_chunk)
+    hero = Hero(world.hero)
+    camera.follow(hero.rect)
+    world.stream(camera.view, load_chunk, evict_chunk)
+    level_snapshot = save_snapshot()
+
+
+def load_chunk(data):
+    """Create the platforms and enemies of a chunk that came into range"""
+    chunk_platforms = []
+    for x, y, w, h in data.platforms:
+        plat = Platform(x, y, w, h)
+        chunk_platforms.append(plat)
+        platforms.append(plat)
+        platform_grid.insert(plat, plat.rect)
+    chunk_enemies = []
+    for x1, x2, y, start in data.enemies:
+        e = Enemy(x1, x2, y, start)
+        chunk_enemies.append(e)
+        enemies.append(e)
+        enemy_pool.add(e)
+        enemy_grid.insert(e, e.rect)
+    return chunk_platforms, chunk_enemies
+
+
+def evict_chunk(objects):
+    """Forget the platforms and enemies of a chunk far from the camera"""
+    chunk_platforms, chunk_enemies = objects
+    for plat in chunk_platforms:
+        platform_grid.remove(plat)
+    for e in chunk_enemies:
+        enemy_grid.remove(e)
+        enemy_pool.remove(e)
+    gone = set(chunk_platforms)
+    platforms[:] = [plat for plat in platforms if plat not in gone]
+    enemies[:] = [e for e in enemies if e.pool is not None]
+
+
+def save_snapshot():
+    """Capture the mutable world state; platforms never change"""
+    return (
+        snapshot.capture(hero, Hero.SNAPSHOT_FIELDS),
+        enemy_pool.snapshot(),
+        enemy_pool.rng.getstate(),
+        world.generation,
+    )
+
+
+def restore_snapshot(saved):
+    """Put the world back into a saved state, reusing the same objects.
+
+    If chunks were loaded or evicted since the snapshot, the enemies it
+    describes are gone; the chunks around the hero are then reloaded.
+    """
+    global level_snapshot
+    hero_state, pool_state, rng_state, generation = saved
+    snapshot.restore(hero, Hero.SNAPSHOT_FIELDS, hero_state)
+    hero.rect.topleft = (round(hero.x), round(hero.y))
+    camera.follow(hero.rect)
+    reloaded = world.generation != generation
+    if reloaded:
+        world.evict_all(evict_chunk)
+        # mesma semente que o load_level(): os inimigos renascem com as
+        # velocidades da primeira vez; o estado salvo volta logo abaixo
+        world_rng.seed(world_seed)
+        world.stream(camera.view, load_chunk, evict_chunk)
+    else:
+        for e in enemy_pool.restore(pool_state):
+            enemy_grid.move(e, e.rect)
+    enemy_pool.rng.setstate(rng_state)
+    physics.reset()
+    if reloaded and saved is level_snapshot:
+        level_snapshot = save_snapshot()
+
+
+def reset_level():
+    """Restart the current level after a death"""
+    global deaths
+    deaths += 1
+    restore_snapshot(level_snapshot)
 
 
 def update(dt):
     if state == STATE_PLAY:
+        physics.advance(dt, step_world)
+
+
+def step_world(dt):
+    """Advance the world by one fixed physics step"""
+    if recorder is not None:
+        recorder.tick(keyboard)
+    with profiler.section('hero'):
         hero.update(dt)
-        for e in enemies:
-            e.update(dt)
-        for e in enemies:
-            if hero.rect.colliderect(e.rect):
-                load_level()
-                break
-    elif state == STATE_MENU:
-        for btn in menu_buttons:
-            btn.check_hover(mouse_pos)
+    # caiu para fora do mundo: reinicia como ao tocar num inimigo
+    if hero.rect.top > world.height:
+        reset_level()
+        return
+    with profiler.section('streaming'):
+        camera.follow(hero.rect)
+        world.stream(camera.view, load_chunk, evict_chunk)
+    with profiler.section('enemies'):
+        for e in enemy_pool.update(dt):
+            enemy_grid.move(e, e.rect)
+    with profiler.section('collisions'):
+        near = enemy_pool.sync(enemy_grid.query(hero.rect))
+        hit = any(hero.rect.colliderect(e.rect) for e in near)
+    if hit:
+        reset_level()
 
 
 def draw():
+    # menu parado: a tela do quadro anterior continua valendo (o painel do
+    # profiler muda a cada quadro, então com ele ligado tudo é redesenhado)
+    if state == STATE_MENU and not menu.redraw() and not profiler.enabled:
+        return
     screen.clear()
     if state == STATE_MENU:
-        screen.draw.text("My Platformer Adventure",
-                         center=(WIDTH//2, 100), fontsize=60, color='white', owidth=2.0, ocolor='black')
-        for btn in menu_buttons:
-            btn.draw()
+        with profiler.section('text'):
+            text_cache.draw(screen, "My Platformer Adventure",
+                            center=(WIDTH//2, 100), fontsize=60, color='white', owidth=2.0, ocolor='black')
+            for btn in menu_buttons:
+                btn.draw()
     elif state == STATE_PLAY:
-        for plat in platforms:
-            plat.draw()
-        hero.draw()
-        for e in enemies:
-            e.draw()
+        # a câmera segue o herói onde ele é desenhado (interpolado), não onde
+        # ficou no último passo; senão o cenário anda aos saltos de um passo
+        # e o herói treme contra ele
+        camera.follow(hero.draw_rect(physics.alpha))
+        # só o que está perto da câmera é desenhado
+        with profiler.section('culling'):
+            visible_platforms = camera.visible(platform_grid)
+            visible_enemies = camera.visible(enemy_grid, CULL_MARGIN, enemy_pool.sync)
+        with profiler.section('platform draw'):
+            for plat in visible_platforms:
+                plat.draw()
+        with profiler.section('sprite draw'):
+            hero.draw(physics.alpha)
+            for e in visible_enemies:
+                e.draw(physics.alpha)
+        drawn = len(visible_platforms) + len(visible_enemies) + 1
+        draw_stats['drawn'] = drawn
+        draw_stats['culled'] = len(platforms) + len(enemies) + 1 - drawn
+        if SHOW_DRAW_STATS:
+            with profiler.section('text'):
+                screen.draw.text(f"drawn {drawn}  culled {draw_stats['culled']}",
+                                 topleft=(10, 10), fontsize=24, color='white')
 
 
 def on_mouse_down(pos):
+    if recorder is not None:
+        recorder.click(pos)
     if state == STATE_MENU:
-        for btn in menu_buttons:
-            btn.check_click(pos)
+        menu.on_mouse_down(pos)
 
 def on_mouse_move(pos):
-    global mouse_pos
-    mouse_pos = pos
+    if state == STATE_MENU:
+        menu.on_mouse_move(pos)
 
 init_menu()
+
+# com PROFILE=1, mede cada quadro e mostra o painel (ver profiler.py)
+update = profiler.wrap_update(update)
+draw = profiler.wrap_draw(draw, lambda: screen)
+profiler.dump_at_exit()
+if recorder is not None:
+    recorder.save_at_exit(lambda: {'hero': [hero.x, hero.y]} if hero else None)
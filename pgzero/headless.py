@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+Modo sem janela (headless) para o jogo de plataforma.
+
+Carrega o game2.py como o pgzrun faria, mas no lugar de `screen`, `keyboard`,
+`music` e `sounds` injeta versões falsas que não abrem janela nem tocam som.
+Assim dá para avançar o mundo chamando `update(dt)` milhões de vezes, por
+exemplo para validar fases ou rodar testes em máquinas sem monitor.
+
+Uso:
+    python headless.py --frames 100000
+"""
+import os
+
+# nada de janela nem de placa de som
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import sys
+import time
+import types
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+class ScriptedKeyboard:
+    """Stand-in for pgzero's keyboard; every key not pressed reads False"""
+    def __init__(self):
+        self.pressed = set()
+
+    def set_keys(self, names):
+        self.pressed = set(names)
+
+    def __getattr__(self, name):
+        return name in self.pressed
+
+    def __getitem__(self, name):
+        return name in self.pressed
+
+
+class _Null:
+    """Accepts any method call and does nothing"""
+    def __getattr__(self, name):
+        return self
+
+    def __call__(self, *args, **kwargs):
+        return None
+
+
+class NullScreen(_Null):
+    """Screen that draws nothing"""
+    @property
+    def draw(self):
+        return _Null()
+
+
+class NullMusic(_Null):
+    """Music player that plays nothing"""
+    def is_playing(self, name=None):
+        return False
+
+
+class NullSounds:
+    """Sound loader whose sounds are silent"""
+    def __getattr__(self, name):
+        return _Null()
+
+
+def load_game(path=os.path.join(HERE, 'game2.py'), keyboard=None):
+    """Run a pgzero game module without a display and return it"""
+    path = os.path.abspath(path)
+    name = os.path.splitext(os.path.basename(path))[0]
+    # como o loaders.set_root() do pgzero: os módulos auxiliares ficam na
+    # pasta do jogo
+    if os.path.dirname(path) not in sys.path:
+        sys.path.insert(0, os.path.dirname(path))
+    with open(path, encoding='utf-8') as f:
+        code = compile(f.read(), os.path.basename(path), 'exec', dont_inherit=True)
+
+    mod = types.ModuleType(name)
+    mod.__file__ = path
+    sys.modules[name] = mod
+    mod.screen = NullScreen()
+    mod.keyboard = keyboard or ScriptedKeyboard()
+    mod.music = NullMusic()
+    mod.sounds = NullSounds()
+    mod.exit = sys.exit
+    exec(code, mod.__dict__)
+    return mod
+
+
+def run(game, frames, dt=1 / 60, script=None):
+    """Step game.update(dt) for the given number of frames.
+
+    script is either a callable frame -> pressed key names, or a list of
+    (frame, key names) changes; keys stay pressed until the next change.
+    """
+    keyboard = game.keyboard
+    changes = {} if script is None or callable(script) else dict(script)
+    update = game.update
+    for frame in range(frames):
+        if callable(script):
+            keyboard.set_keys(script(frame))
+        elif frame in changes:
+            keyboard.set_keys(changes[frame])
+        update(dt)
+    return game
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('game', nargs='?', default=os.path.join(HERE, 'game2.py'))
+    parser.add_argument('--frames', type=int, default=100000)
+    parser.add_argument('--dt', type=float, default=1 / 60)
+    args = parser.parse_args(argv)
+
+    game = load_game(args.game)
+    game.start_game()
+    # anda para a direita e pula de vez em quando
+    script = lambda frame: ('right', 'up') if frame % 90 < 10 else ('right',)
+    start = time.perf_counter()
+    run(game, args.frames, args.dt, script)
+    elapsed = time.perf_counter() - start
+    print(f"{args.frames} frames em {elapsed:.2f}s "
+          f"({args.frames / elapsed:,.0f} frames/s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -7,6 +7,9 @@ from pygame import Rect
 WIDTH = 800
 HEIGHT = 600
 
+SEED = None  # semente das perguntas; um número fixo repete a mesma sequência
+rng = random.Random(SEED)
+
 pontuacao = 0
 pergunta = ""
 respostas = []
@@ -16,8 +19,8 @@ botoes = []
 def nova_pergunta():
     global pergunta, respostas, resposta_certa, botoes
     botoes = []
-    x = random.randint(2, 10)
-    resultado = x * random.randint(1, 10)
+    x = rng.randint(2, 10)
+    resultado = x * rng.randint(1, 10)
     #pergunta = f"{resultado} ÷ {x} = ?"
     pergunta = f"{resultado} \u00F7 {x} = ?"
     #
@@ -26,11 +29,11 @@ def nova_pergunta():
     respostas = [resposta_certa]
 
     while len(respostas) < 4:
-        falsa = random.randint(1, 10)
+        falsa = rng.randint(1, 10)
         if falsa not in respostas:
             respostas.append(falsa)
 
-    random.shuffle(respostas)
+    rng.shuffle(respostas)
 
     for i in range(4):
         rect = Rect(300, 200 + i * 80, 200, 50)
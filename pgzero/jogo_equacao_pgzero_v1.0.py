@@ -1,97 +1,121 @@
 # -*- coding: utf-8 -*-
 import random
-import time
 from pygame import Rect
 
+from text_cache import TextCache
+from dirty_rects import DirtyRegions
+
 WIDTH = 800
 HEIGHT = 600
 
+SEED = None  # semente das perguntas; um número fixo repete a mesma sequência
+rng = random.Random(SEED)
+
 pontuacao = 0
 pergunta = ""
 respostas = []
 resposta_certa = 0
 botoes = []
+# textos já rasterizados, reaproveitados de um quadro para o outro
+text_cache = TextCache()
+# cada região da tela só é redesenhada quando o que ela mostra muda
+regioes = DirtyRegions()
 
 # --- NOVAS VARIÁVEIS ---
-TIME_LIMIT = 15.0               # segundos por pergunta
-question_start = 0.0            # quando a pergunta atual começou
+TIME_LIMIT = 15                 # segundos por pergunta
+tempo_restante = TIME_LIMIT     # segundos que ainda faltam na pergunta atual
 feedback = ""                   # texto: “Acertou!”, “Errou!”
-feedback_timer = 0.0            # quanto tempo ainda mostrar o feedback
+FEEDBACK_TIME = 1.5             # quanto tempo mostrar o feedback
+
+# Não há update(dt): sem ele o pgzero só chama o draw() quando o relógio
+# (clock) dispara ou quando há um clique, em vez de 60 vezes por segundo.
+
+def tique():
+    """Chamado pelo relógio do pgzero uma vez por segundo"""
+    global tempo_restante
+    tempo_restante -= 1
+    if tempo_restante <= 0:
+        nova_pergunta()
+
+def limpa_feedback():
+    global feedback
+    feedback = ""
 
 def nova_pergunta():
     global pergunta, respostas, resposta_certa, botoes
-    global question_start
+    global tempo_restante
 
     botoes = []
-    x = random.randint(2, 10)
-    resultado = x * random.randint(1, 10)
+    x = rng.randint(2, 10)
+    resultado = x * rng.randint(1, 10)
     pergunta = f"{resultado} \u00F7 {x} = ?"
     resposta_certa = resultado // x
 
     respostas = [resposta_certa]
     while len(respostas) < 4:
-        falsa = random.randint(1, 10)
+        falsa = rng.randint(1, 10)
         if falsa not in respostas:
             respostas.append(falsa)
-    random.shuffle(respostas)
+    rng.shuffle(respostas)
 
     # criar botoes na tela
     for i in range(4):
         rect = Rect(300, 200 + i * 80, 200, 50)
         botoes.append(rect)
 
-    # reinicia o cronômetro
-    question_start = time.time()
+    # reinicia o cronômetro: um tique por segundo a partir de agora
+    tempo_restante = TIME_LIMIT
+    clock.unschedule(tique)
+    clock.schedule_interval(tique, 1.0)
 
 # primeira pergunta
 nova_pergunta()
 
-def update(dt):
-    global feedback, feedback_timer
-
-    # atualiza o timer do feedback
-    if feedback_timer > 0:
-        feedback_timer -= dt
-        if feedback_timer <= 0:
-            feedback = ""
-
-    # verifica se o tempo acabou
-    elapsed = time.time() - question_start
-    if elapsed >= TIME_LIMIT:
-        nova_pergunta()
-
-def draw():
-    screen.clear()
-
+def desenha_regioes():
+    """Desenha as regiões cujo valor mudou desde o último draw()"""
     # pontuação
-    screen.draw.text(f"Pontua\u00E7\u00E3o: {pontuacao}", (10, 10), fontsize=40)
+    if regioes.changed(screen, 'pontuacao', pontuacao):
+        regioes.painted('pontuacao', text_cache.draw(
+            screen, f"Pontua\u00E7\u00E3o: {pontuacao}", (10, 10), fontsize=40))
 
     # temporizador
-    elapsed = time.time() - question_start
-    time_left = max(0, int(TIME_LIMIT - elapsed))
-    screen.draw.text(f"Tempo: {time_left}s", (WIDTH - 160, 10), fontsize=35)
+    if regioes.changed(screen, 'tempo', tempo_restante):
+        regioes.painted('tempo', text_cache.draw(
+            screen, f"Tempo: {tempo_restante}s", (WIDTH - 160, 10), fontsize=35))
 
     # pergunta
-    screen.draw.text(pergunta, center=(WIDTH//2, 100), fontsize=50)
+    if regioes.changed(screen, 'pergunta', pergunta):
+        regioes.painted('pergunta', text_cache.draw(
+            screen, pergunta, center=(WIDTH//2, 100), fontsize=50))
 
     # botões de resposta
     for i, rect in enumerate(botoes):
-        screen.draw.filled_rect(rect, "orange")
-        screen.draw.text(str(respostas[i]),
-                         center=rect.center,
-                         fontsize=40, color="black")
+        if regioes.changed(screen, f'botao{i}', respostas[i]):
+            screen.draw.filled_rect(rect, "orange")
+            text_cache.draw(screen, str(respostas[i]),
+                            center=rect.center,
+                            fontsize=40, color="black")
+            regioes.painted(f'botao{i}', rect)
 
     # feedback
-    if feedback:
-        screen.draw.text(feedback,
-                         center=(WIDTH//2, HEIGHT//2 + 200),
-                         fontsize=60, color="yellow")
+    if regioes.changed(screen, 'feedback', feedback) and feedback:
+        regioes.painted('feedback', text_cache.draw(
+            screen, feedback,
+            center=(WIDTH//2, HEIGHT//2 + 200),
+            fontsize=60, color="yellow"))
+
+def draw():
+    regioes.begin(screen)
+    desenha_regioes()
+    # apagar uma região pode ter apagado um pedaço de outra já desenhada
+    if regioes.pending():
+        desenha_regioes()
 
 def on_mouse_down(pos):
-    global pontuacao, feedback, feedback_timer
+    global pontuacao, feedback
 
     # só processa clique se o feedback já tiver expirado
-    if feedback_timer > 0:
+    if feedback:
         return
 
     for i, rect in enumerate(botoes):
@@ -104,7 +128,7 @@ def on_mouse_down(pos):
                     pontuacao -= 1
                 feedback = "Errou!"
             # exibe feedback por 1.5 segundos
-            feedback_timer = 1.5
+            clock.schedule_unique(limpa_feedback, FEEDBACK_TIME)
             # gera a próxima pergunta (reinicia timer)
             nova_pergunta()
             break
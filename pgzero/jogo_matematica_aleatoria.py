@@ -2,31 +2,38 @@
 import random
 from pygame import Rect
 
+from text_cache import TextCache
+
 WIDTH = 800
 HEIGHT = 600
 
+SEED = None  # semente das perguntas; um número fixo repete a mesma sequência
+rng = random.Random(SEED)
+
 pontuacao = 0
 pergunta = ""
 respostas = []
 resposta_certa = 0
 botoes = []
+# textos já rasterizados, reaproveitados de um quadro para o outro
+text_cache = TextCache()
 
 def nova_pergunta():
     global pergunta, respostas, resposta_certa, botoes
     botoes = []
-    x = random.randint(2, 10)
-    resultado = x * random.randint(1, 10)
+    x = rng.randint(2, 10)
+    resultado = x * rng.randint(1, 10)
     pergunta = f"{resultado} ÷ {x} = ?"
     resposta_certa = resultado // x
     respostas = [resposta_certa]
 
     # Gerar alternativas falsas
     while len(respostas) < 4:
-        falsa = random.randint(1, 10)
+        falsa = rng.randint(1, 10)
         if falsa not in respostas:
             respostas.append(falsa)
 
-    random.shuffle(respostas)
+    rng.shuffle(respostas)
 
     # Criar retângulos dos botões (Rect) para detecção de clique
     for i in range(4):
@@ -37,12 +44,12 @@ nova_pergunta()
 
 def draw():
     screen.clear()
-    screen.draw.text(f"Pontuação: {pontuacao}", (10, 10), fontsize=40)
-    screen.draw.text(pergunta, center=(WIDTH//2, 100), fontsize=50)
+    text_cache.draw(screen, f"Pontuação: {pontuacao}", (10, 10), fontsize=40)
+    text_cache.draw(screen, pergunta, center=(WIDTH//2, 100), fontsize=50)
 
     for i in range(4):
         screen.draw.filled_rect(botoes[i], "orange")
-        screen.draw.text(str(respostas[i]), center=botoes[i].center, fontsize=40, color="black")
+        text_cache.draw(screen, str(respostas[i]), center=botoes[i].center, fontsize=40, color="black")
 
 def on_mouse_down(pos):
     global pontuacao
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+Fases descritas em arquivos, em vez de código Python.
+
+Cada fase é escrita em JSON na pasta levels/ (fácil de editar à mão):
+
+    {
+        "width": 800, "height": 600,
+        "hero": [x, y],
+        "platforms": [[x, y, largura, altura], ...],
+        "enemies": [[x1, x2, y], ...]
+    }
+
+Plataformas são retângulos com o canto superior esquerdo em (x, y). Cada
+inimigo patrulha entre x1 e x2 na altura y; um quarto número opcional diz
+onde ele começa (por padrão, em x1). O herói e os inimigos usam a mesma
+âncora que o jogo usa para eles (o game1.py posiciona Actors pelo centro).
+
+Na primeira leitura o JSON é convertido para um arquivo binário .lvl (arrays
+de inteiros), que é o que as leituras seguintes usam enquanto o JSON não
+mudar. Depois de lida, a fase fica em cache na memória.
+
+Uso:
+    python level_loader.py   # gera os .lvl de todas as fases
+"""
+import os
+import sys
+import json
+import struct
+from array import array
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+LEVELS_DIR = os.path.join(HERE, 'levels')
+
+MAGIC = b'LVL1'
+# magic, largura, altura, herói x, herói y, nº de plataformas, nº de inimigos
+HEADER = struct.Struct('<4s6i')
+
+_cache = {}
+
+
+class LevelData:
+    """A parsed level: size, hero spawn, platform rects and enemy patrols"""
+    __slots__ = ('width', 'height', 'hero', 'platforms', 'enemies')
+
+    def __init__(self, width, height, hero, platforms, enemies):
+        self.width = width
+        self.height = height
+        self.hero = hero
+        # tuplas (x, y, w, h)
+        self.platforms = platforms
+        # tuplas (x1, x2, y, x inicial)
+        self.enemies = enemies
+
+
+def _rows(values, size):
+    return [tuple(values[i:i + size]) for i in range(0, len(values), size)]
+
+
+def _ints(values):
+    data = array('i', values)
+    if sys.byteorder == 'big':
+        data.byteswap()
+    return data
+
+
+def parse_json(path):
+    with open(path, encoding='utf-8') as f:
+        raw = json.load(f)
+    enemies = []
+    for entry in raw.get('enemies', []):
+        x1, x2, y = entry[:3]
+        start = entry[3] if len(entry) > 3 else x1
+        enemies.append((int(x1), int(x2), int(y), int(start)))
+    return LevelData(
+        int(raw['width']),
+        int(raw['height']),
+        tuple(int(v) for v in raw['hero']),
+        [tuple(int(v) for v in plat) for plat in raw.get('platforms', [])],
+        enemies,
+    )
+
+
+def write_binary(level, path):
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, level.width, level.height,
+                            level.hero[0], level.hero[1],
+                            len(level.platforms), len(level.enemies)))
+        _ints([v for plat in level.platforms for v in plat]).tofile(f)
+        _ints([v for e in level.enemies for v in e]).tofile(f)
+
+
+def read_binary(path):
+    with open(path, 'rb') as f:
+        data = f.read()
+    magic, width, height, hx, hy, n_plat, n_enemy = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a level file")
+    values = array('i')
+    values.frombytes(data[HEADER.size:])
+    if sys.byteorder == 'big':
+        values.byteswap()
+    split = n_plat * 4
+    return LevelData(
+        width, height, (hx, hy),
+        _rows(values[:split], 4),
+        _rows(values[split:split + n_enemy * 4], 4),
+    )
+
+
+def compile_level(name):
+    """Convert levels/<name>.json to levels/<name>.lvl and return the level"""
+    level = parse_json(os.path.join(LEVELS_DIR, name + '.json'))
+    try:
+        write_binary(level, os.path.join(LEVELS_DIR, name + '.lvl'))
+    except OSError:
+        pass  # pasta sem permissão de escrita: segue só com o JSON
+    return level
+
+
+def load(name):
+    """Level by name, read once and then kept in memory"""
+    level = _cache.get(name)
+    if level is not None:
+        return level
+    json_path = os.path.join(LEVELS_DIR, name + '.json')
+    bin_path = os.path.join(LEVELS_DIR, name + '.lvl')
+    if (os.path.exists(bin_path)
+            and os.path.getmtime(bin_path) >= os.path.getmtime(json_path)):
+        level = read_binary(bin_path)
+    else:
+        level = compile_level(name)
+    _cache[name] = level
+    return level
+
+
+if __name__ == '__main__':
+    for filename in sorted(os.listdir(LEVELS_DIR)):
+        if filename.endswith('.json'):
+            name = filename[:-5]
+            level = compile_level(name)
+            print(f"{name}: {len(level.platforms)} plataformas, "
+                  f"{len(level.enemies)} inimigos")
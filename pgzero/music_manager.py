@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""
+Música de fundo que pausa em vez de parar.
+
+O pygame.mixer.music já lê o MP3 aos pedaços enquanto toca (streaming) e,
+tocando em laço, volta ao começo sem reabrir o arquivo. O custo estava em
+chamar music.play() de novo a cada início de fase ou a cada vez que a música
+é ligada: isso reabre o arquivo e recomeça a faixa do zero. Aqui a faixa é
+aberta uma vez; desligar a música só a pausa e ligar de novo continua do
+mesmo ponto.
+"""
+
+
+class MusicManager:
+    """Keeps one looping track open and pauses/unpauses it"""
+    def __init__(self, player):
+        # o módulo music do pgzero (ou o NullMusic do headless.py)
+        self.player = player
+        self.track = None
+        self.playing = False
+
+    def play(self, track):
+        """Start track, or resume it from where it was paused"""
+        if track != self.track:
+            self.player.play(track)  # toca em laço até ser trocada
+            self.track = track
+        elif not self.playing:
+            self.player.unpause()
+        self.playing = True
+
+    def pause(self):
+        if self.playing:
+            self.player.pause()
+            self.playing = False
+
+    def stop(self):
+        """Close the track; the next play() starts it from the beginning"""
+        self.player.stop()
+        self.track = None
+        self.playing = False
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+Carregamento de recursos em segundo plano.
+
+Ler e decodificar PNGs grandes (e redimensionar os fundos) demora; feito no
+começo do script, a janela fica parada até tudo terminar. Aqui cada recurso
+é uma tarefa com duas partes:
+
+- load(): a parte pesada (ler o arquivo, decodificar, redimensionar), que
+  roda numa thread separada, na ordem em que as tarefas foram adicionadas;
+- finish(resultado): a parte rápida que mexe com a tela ou com o pgzero
+  (convert, guardar no cache de imagens), que roda na thread principal
+  quando o jogo chama poll() no update().
+
+Assim o jogo pode mostrar uma tela de carregamento com o progresso e liberar
+o menu assim que os recursos dele estiverem prontos.
+"""
+import queue
+import threading
+
+
+class Preloader:
+    """Runs load jobs on a worker thread; poll() finishes them on the main
+    thread and tracks progress"""
+    def __init__(self):
+        self.jobs = []
+        self.results = {}
+        self.finished = queue.Queue()
+        self.thread = None
+
+    def add(self, key, load, finish=None):
+        """Queue a job; finish(value) runs on the main thread, if given"""
+        self.jobs.append((key, load, finish))
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        for key, load, finish in self.jobs:
+            try:
+                self.finished.put((key, load(), finish, None))
+            except Exception as error:
+                self.finished.put((key, None, finish, error))
+                return
+
+    def poll(self):
+        """Finish the jobs loaded since the last call; return the progress"""
+        while True:
+            try:
+                self._finish(*self.finished.get_nowait())
+            except queue.Empty:
+                break
+        return self.progress
+
+    def _finish(self, key, value, finish, error):
+        if error is not None:
+            raise error
+        if finish is not None:
+            value = finish(value)
+        self.results[key] = value
+
+    @property
+    def progress(self):
+        """Fraction of the jobs done, from 0.0 to 1.0"""
+        if not self.jobs:
+            return 1.0
+        return len(self.results) / len(self.jobs)
+
+    @property
+    def done(self):
+        return len(self.results) == len(self.jobs)
+
+    def ready(self, *keys):
+        return all(key in self.results for key in keys)
+
+    def __getitem__(self, key):
+        return self.results[key]
+
+    def wait(self):
+        """Block until every job is finished (for scripts without a window)"""
+        if self.thread is None:
+            self.start()
+        while not self.done:
+            self._finish(*self.finished.get())
+        return self
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+Medição do tempo de cada quadro, ligada só quando pedida.
+
+Com a variável de ambiente PROFILE=1 o jogo passa a medir, a cada quadro, o
+tempo total do quadro e o de cada parte marcada com profiler.section()
+(herói, inimigos, colisões, desenho das plataformas, textos...). Os últimos
+HISTORY quadros ficam num buffer circular; um painel no canto da tela mostra
+FPS, mediana (p50) e p99 do tempo de quadro e a parte mais lenta, e ao fechar
+o jogo tudo é gravado em PROFILE_FILE (JSON) para comparar depois.
+
+    PROFILE=1 pgzrun game2.py
+
+Desligado, section() devolve sempre o mesmo objeto que não faz nada, e
+update()/draw() não são embrulhados.
+"""
+import os
+import json
+import time
+import atexit
+from collections import deque
+
+ENABLED = os.environ.get('PROFILE') == '1'
+PROFILE_FILE = os.environ.get('PROFILE_FILE', 'profile.json')
+HISTORY = 600  # quadros guardados (10 s a 60 FPS)
+
+
+class _NullSection:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SECTION = _NullSection()
+
+
+class _Section:
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = self.profiler.clock()
+        return self
+
+    def __exit__(self, *exc):
+        times = self.profiler.current
+        times[self.name] = times.get(self.name, 0.0) + self.profiler.clock() - self.start
+        return False
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class Profiler:
+    """Per-frame section timings kept in a ring buffer"""
+    def __init__(self, enabled=ENABLED, history=HISTORY, clock=time.perf_counter):
+        self.enabled = enabled
+        self.clock = clock
+        # cada quadro: {'frame': duração do quadro, seção: tempo, ...}
+        self.frames = deque(maxlen=history)
+        self.current = {}
+        self.frame_start = None
+        self.sections = {}
+
+    def section(self, name):
+        """Context manager adding the time spent inside it to section name"""
+        if not self.enabled:
+            return _NULL_SECTION
+        section = self.sections.get(name)
+        if section is None:
+            section = self.sections[name] = _Section(self, name)
+        return section
+
+    def next_frame(self):
+        """Close the current frame record and start a new one"""
+        now = self.clock()
+        if self.frame_start is not None:
+            self.current['frame'] = now - self.frame_start
+            self.frames.append(self.current)
+        self.current = {}
+        self.frame_start = now
+
+    def wrap_update(self, update):
+        """update(dt) that starts a frame and times itself as 'update'"""
+        if not self.enabled:
+            return update
+        section = self.section('update')
+
+        def profiled_update(dt):
+            self.next_frame()
+            with section:
+                update(dt)
+        return profiled_update
+
+    def wrap_draw(self, draw, get_screen):
+        """draw() timed as 'draw', followed by the overlay; get_screen()
+        returns the screen, which pgzero only creates after the module runs"""
+        if not self.enabled:
+            return draw
+        section = self.section('draw')
+
+        def profiled_draw():
+            with section:
+                draw()
+            self.draw_overlay(get_screen())
+        return profiled_draw
+
+    def stats(self):
+        """FPS, p50 and p99 frame time (ms) and the slowest section"""
+        periods = [f['frame'] for f in self.frames]
+        if not periods:
+            return None
+        totals = {}
+        for frame in self.frames:
+            for name, value in frame.items():
+                if name not in ('frame', 'update', 'draw'):
+                    totals[name] = totals.get(name, 0.0) + value
+        slowest = max(totals, key=totals.get) if totals else None
+        return {
+            'fps': len(periods) / sum(periods) if sum(periods) else 0.0,
+            'p50_ms': percentile(periods, 0.50) * 1000,
+            'p99_ms': percentile(periods, 0.99) * 1000,
+            'slowest': slowest,
+            'slowest_ms': totals[slowest] / len(periods) * 1000 if slowest else 0.0,
+        }
+
+    def draw_overlay(self, screen):
+        stats = self.stats()
+        if stats is None:
+            return
+        lines = [
+            f"{stats['fps']:.0f} FPS",
+            f"p50 {stats['p50_ms']:.1f} ms  p99 {stats['p99_ms']:.1f} ms",
+        ]
+        if stats['slowest']:
+            lines.append(f"{stats['slowest']} {stats['slowest_ms']:.2f} ms")
+        screen.draw.text("\n".join(lines), topright=(screen.width - 10, 10),
+                         fontsize=18, color='yellow', owidth=1.0, ocolor='black')
+
+    def dump(self, path=PROFILE_FILE):
+        """Write the recorded frames (seconds) and the summary to path"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'summary': self.stats(), 'frames': list(self.frames)}, f, indent=1)
+        return path
+
+    def dump_at_exit(self, path=PROFILE_FILE):
+        if self.enabled:
+            atexit.register(self.dump, path)
+
+
+# perfil compartilhado pelos módulos de um mesmo jogo
+profiler = Profiler()
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""
+Gravação e reprodução de partidas do game2.py.
+
+A física do game2.py anda em passos fixos e tudo que é sorteado no mundo sai
+de um gerador com semente (world_rng). Então, para repetir uma partida
+exatamente, basta guardar a semente, a fase e quais teclas estavam
+apertadas em cada passo (só as mudanças) e os cliques do mouse:
+
+    RECORD=partida.json pgzrun game2.py    # joga e grava ao fechar
+
+A reprodução roda sem janela e sem esperar o relógio, passo a passo, o mais
+rápido que der, e no fim confere se o herói terminou no mesmo lugar:
+
+    python replay.py partida.json
+"""
+import os
+import sys
+import json
+import time
+import atexit
+
+RECORD = os.environ.get('RECORD')  # arquivo onde gravar a partida
+KEYS = ('left', 'right', 'up')  # teclas que o game2.py lê
+
+
+class InputRecorder:
+    """Logs pressed keys per fixed physics tick, and mouse clicks"""
+    def __init__(self, keys=KEYS):
+        self.keys = keys
+        self.path = None
+        self.session = None
+        self.pressed = None
+
+    @classmethod
+    def from_env(cls, path=RECORD):
+        """A recorder saving to path at exit, or None when not recording"""
+        if not path:
+            return None
+        recorder = cls()
+        recorder.path = path
+        return recorder
+
+    def start(self, seed, level, step):
+        self.session = {
+            'seed': seed,
+            'level': level,
+            'step': step,
+            'ticks': 0,
+            'keys': [],   # [passo, [teclas apertadas]] a cada mudança
+            'mouse': [],  # [passo, x, y] a cada clique
+        }
+        self.pressed = None
+
+    def tick(self, keyboard):
+        """Call once per physics step, before the world reads the keyboard"""
+        session = self.session
+        if session is None:
+            return
+        pressed = [key for key in self.keys if getattr(keyboard, key)]
+        if pressed != self.pressed:
+            session['keys'].append([session['ticks'], pressed])
+            self.pressed = pressed
+        session['ticks'] += 1
+
+    def click(self, pos):
+        if self.session is not None:
+            self.session['mouse'].append([self.session['ticks'], pos[0], pos[1]])
+
+    def save(self, path, final=None):
+        if self.session is None:
+            return None
+        session = dict(self.session, final=final)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(session, f)
+        return path
+
+    def save_at_exit(self, final=lambda: None):
+        """Save to the from_env() path when the game closes; final() gives
+        the end state the replay is checked against"""
+        atexit.register(lambda: self.save(self.path, final()))
+
+
+def load_session(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+class ReplayPlayer:
+    """Re-runs a recorded session on a headless game2.py, tick by tick"""
+    def __init__(self, session):
+        self.session = session
+
+    def run(self, game=None, on_tick=None):
+        """Replay the session and return the game module; on_tick(game,
+        tick) runs after every step and stops the replay by returning True"""
+        session = self.session
+        if game is None:
+            # importado só aqui: o headless.py troca o vídeo e o som por
+            # drivers falsos, o que o jogo gravando não pode sofrer
+            import headless
+            game = headless.load_game()
+        game.LEVEL = session['level']
+        game.world_seed = session['seed']
+        game.start_game()
+        keys = {tick: pressed for tick, pressed in session['keys']}
+        clicks = {}
+        for tick, x, y in session['mouse']:
+            clicks.setdefault(tick, []).append((x, y))
+        keyboard = game.keyboard
+        step_world, step = game.step_world, session['step']
+        for tick in range(session['ticks']):
+            if tick in keys:
+                keyboard.set_keys(keys[tick])
+            for pos in clicks.get(tick, ()):
+                game.on_mouse_down(pos)
+            step_world(step)
+            if on_tick is not None and on_tick(game, tick):
+                break
+        return game
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('session')
+    args = parser.parse_args(argv)
+
+    session = load_session(args.session)
+    start = time.perf_counter()
+    game = ReplayPlayer(session).run()
+    elapsed = time.perf_counter() - start
+    ticks = session['ticks']
+    print(f"{ticks} passos em {elapsed:.2f}s ({ticks / max(elapsed, 1e-9):,.0f} passos/s)")
+    final = session.get('final')
+    if final:
+        same = [game.hero.x, game.hero.y] == final['hero']
+        print(f"herói em ({game.hero.x:.1f}, {game.hero.y:.1f}); "
+              + ("igual à gravação" if same else f"gravação: {final['hero']}"))
+        return 0 if same else 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
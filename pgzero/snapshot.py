@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+"""
+Fotografia (snapshot) do estado que muda durante a fase.
+
+Para reiniciar uma fase não é preciso recriar plataformas, inimigos e herói:
+basta guardar, logo depois de montar a fase, os atributos que mudam durante o
+jogo (posições, velocidades, timers) e depois devolvê-los aos mesmos objetos.
+"""
+
+
+def capture(obj, fields):
+    """Values of the given attributes of obj, in order"""
+    return tuple(getattr(obj, name) for name in fields)
+
+
+def restore(obj, fields, values):
+    """Write back values taken by capture() into the same object"""
+    for name, value in zip(fields, values):
+        setattr(obj, name, value)
+
+
+def capture_all(objs, fields):
+    return [capture(obj, fields) for obj in objs]
+
+
+def restore_all(objs, fields, values):
+    for obj, saved in zip(objs, values):
+        restore(obj, fields, saved)
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+Grade espacial (spatial hash) para acelerar as colisões.
+
+Em vez de comparar o herói com todas as plataformas e todos os inimigos do
+nível, cada objeto é guardado nas células de uma grade uniforme que o seu
+retângulo ocupa. Uma consulta só olha as células perto do retângulo pedido.
+"""
+
+
+class SpatialHash:
+    """Uniform grid that maps cells to the objects overlapping them"""
+    def __init__(self, cell_size=128):
+        self.cell_size = cell_size
+        self.cells = {}
+        # objeto -> (x0, y0, x1, y1) das células que ele ocupa
+        self.spans = {}
+
+    def _span(self, rect):
+        size = self.cell_size
+        return (
+            int(rect.left // size),
+            int(rect.top // size),
+            int((rect.right - 1) // size),
+            int((rect.bottom - 1) // size),
+        )
+
+    def clear(self):
+        self.cells.clear()
+        self.spans.clear()
+
+    def insert(self, obj, rect):
+        span = self._span(rect)
+        self.spans[obj] = span
+        x0, y0, x1, y1 = span
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                self.cells.setdefault((cx, cy), []).append(obj)
+
+    def remove(self, obj):
+        span = self.spans.pop(obj, None)
+        if span is None:
+            return
+        x0, y0, x1, y1 = span
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                bucket = self.cells.get((cx, cy))
+                if bucket is None:
+                    continue
+                bucket.remove(obj)
+                if not bucket:
+                    del self.cells[(cx, cy)]
+
+    def move(self, obj, rect):
+        """Update obj after it moved; cheap when it stays in the same cells"""
+        if self.spans.get(obj) == self._span(rect):
+            return
+        self.remove(obj)
+        self.insert(obj, rect)
+
+    def query(self, rect):
+        """Objects whose cells overlap rect, without duplicates"""
+        x0, y0, x1, y1 = self._span(rect)
+        cells = self.cells
+        if x0 == x1 and y0 == y1:
+            return list(cells.get((x0, y0), ()))
+        found = []
+        seen = set()
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                for obj in cells.get((cx, cy), ()):
+                    if id(obj) not in seen:
+                        seen.add(id(obj))
+                        found.append(obj)
+        return found
+
+    def __len__(self):
+        return len(self.spans)
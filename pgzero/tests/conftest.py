@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+"""
+Os testes rodam sem janela nem som e importam os módulos da pasta pgzero/
+como o pgzrun faria (a pasta do jogo no sys.path).
+
+    python -m pytest pgzero/tests
+"""
+import os
+import sys
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+GAME_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if GAME_DIR not in sys.path:
+    sys.path.insert(0, GAME_DIR)
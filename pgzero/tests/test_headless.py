@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+Comportamento do game2.py rodando sem janela (headless.py).
+"""
+import random
+
+import pytest
+from pygame import Rect
+
+import headless
+import enemy_pool
+from spatial import SpatialHash
+from replay import InputRecorder, ReplayPlayer
+
+
+@pytest.fixture
+def game():
+    game = headless.load_game()
+    game.recorder = None
+    game.world_seed = 1
+    game.start_game()
+    return game
+
+
+def test_fast_fall_lands_on_thin_platform(game):
+    # cai 50 px por passo sobre uma plataforma de 20 px: sem o teste de
+    # colisão contínuo o herói atravessaria a plataforma
+    game.platform_grid.clear()
+    plat = game.Platform(100, 400, 200, 20)
+    game.platform_grid.insert(plat, plat.rect)
+    hero = game.hero
+    hero.x, hero.y = 150.0, 100.0
+    hero.vy = 50 / game.physics.step
+    for _ in range(20):
+        hero.update(game.physics.step)
+        if hero.on_ground:
+            break
+    assert hero.on_ground
+    assert hero.rect.bottom == plat.rect.top
+
+
+class Patrol:
+    """Minimal stand-in for game2's Enemy"""
+    frame_time = 0.2
+    move_frames = [0, 1]
+
+    def __init__(self, x1, x2, speed):
+        self.rect = Rect(x1, 500, 48, 48)
+        self.bounds = (x1, x2)
+        self.base_speed = speed
+        self.pool = self.index = None
+
+
+def _patrols(n, rng):
+    enemies = []
+    for i in range(n):
+        x1 = rng.randrange(0, 2000)
+        enemies.append(Patrol(x1, x1 + rng.randrange(50, 300), rng.randint(80, 120)))
+    return enemies
+
+
+def _run_pool(numpy_min, steps=600):
+    pool = enemy_pool.EnemyPool(random.Random(3))
+    for e in _patrols(100, random.Random(7)):
+        pool.add(e)
+    original = enemy_pool.NUMPY_MIN_ENEMIES
+    enemy_pool.NUMPY_MIN_ENEMIES = numpy_min
+    try:
+        trace = []
+        for _ in range(steps):
+            moved = pool.update(1 / 120)
+            trace.append(sorted(e.index for e in moved))
+    finally:
+        enemy_pool.NUMPY_MIN_ENEMIES = original
+    return pool, trace
+
+
+def test_enemy_pool_numpy_matches_lists():
+    if enemy_pool.np is None:
+        pytest.skip("NumPy não instalado")
+    arrays, arrays_trace = _run_pool(0)
+    lists, lists_trace = _run_pool(10 ** 9)
+    assert arrays.packed and not lists.packed
+    assert arrays_trace == lists_trace
+    assert ([e.rect.x for e in arrays.sync(arrays.enemies)]
+            == [e.rect.x for e in lists.sync(lists.enemies)])
+    assert list(arrays.x) == pytest.approx(list(lists.x))
+
+
+def test_enemy_pool_reports_only_cell_changes():
+    pool = enemy_pool.EnemyPool(random.Random(3), cell_size=64)
+    enemies = _patrols(50, random.Random(7))
+    grid = SpatialHash(64)
+    for e in enemies:
+        pool.add(e)
+        grid.insert(e, e.rect)
+    for _ in range(600):
+        for e in pool.update(1 / 120):
+            grid.move(e, e.rect)
+    # a grade continua certa para todos, mesmo com Rects não sincronizados
+    pool.sync(enemies)
+    assert all(grid.spans[e] == grid._span(e.rect) for e in enemies)
+
+
+def test_spatial_hash_query_matches_brute_force():
+    rng = random.Random(5)
+    grid = SpatialHash(64)
+    rects = {i: Rect(rng.randrange(0, 1000), rng.randrange(0, 1000),
+                     rng.randrange(1, 200), rng.randrange(1, 200)) for i in range(300)}
+    for i, rect in rects.items():
+        grid.insert(i, rect)
+    for i in range(0, 300, 3):
+        grid.remove(i)
+        del rects[i]
+    for _ in range(200):
+        probe = Rect(rng.randrange(0, 1000), rng.randrange(0, 1000), 48, 64)
+        found = {i for i in grid.query(probe) if rects[i].colliderect(probe)}
+        assert found == {i for i, rect in rects.items() if rect.colliderect(probe)}
+
+
+def test_replay_reaches_recorded_final_position(game):
+    recorder = game.recorder = InputRecorder()
+    game.start_game()
+    script = lambda frame: ('right', 'up') if frame % 90 < 10 else ('right',)
+    headless.run(game, 600, 1 / 60, script)
+    final = [game.hero.x, game.hero.y]
+    session = dict(recorder.session, final={'hero': final})
+    assert session['ticks'] > 0 and session['keys']
+
+    game.recorder = None
+    ReplayPlayer(session).run(game)
+    assert [game.hero.x, game.hero.y] == final
+
+
+def test_death_inside_physics_step_keeps_alpha_in_range(game):
+    game.hero.y = game.world.height + 100.0  # caiu para fora do mundo
+    game.hero.rect.top = int(game.hero.y)
+    game.update(1 / 60)
+    assert game.deaths == 1
+    assert game.physics.accumulator >= 0.0
+    assert 0.0 <= game.physics.alpha <= 1.0
@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+"""
+O cache de textos fica limitado e não enche o cache interno do ptext.
+"""
+import pygame
+from pgzero import ptext
+
+from text_cache import TextCache
+
+
+def test_text_cache_is_bounded():
+    pygame.display.set_mode((1, 1))  # o ptext converte para o formato da tela
+    cache = TextCache(maxsize=16)
+    before = len(ptext._surf_cache)
+    for i in range(200):
+        cache.get(f"Pontuação: {i}", fontsize=20, owidth=1.0, ocolor='black')
+    assert len(cache.surfaces) == 16
+    assert len(ptext._surf_cache) == before
+    assert (cache.hits, cache.misses) == (0, 200)
+    cache.get("Pontuação: 199", fontsize=20, owidth=1.0, ocolor='black')
+    cache.get("Pontuação: 0", fontsize=20, owidth=1.0, ocolor='black')
+    assert (cache.hits, cache.misses) == (1, 201)
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+Cache de textos já rasterizados, com tamanho limitado.
+
+O screen.draw.text do pgzero passa pelo ptext.draw, que guarda cada texto
+rasterizado e limpa esse cache (ptext.clean) quando ele passa de
+MEMORY_LIMIT_MB. Quem chama o ptext.getsurf direto, como aqui, não passa
+pelo clean(): com cache=True cada placar diferente ficaria guardado para
+sempre. Então os textos são pedidos com cache=False e guardados num cache
+próprio, que descarta os menos usados quando enche (LRU). Hits e misses
+contam o que estava ou não neste cache.
+
+Perto de um screen.draw.text o ganho por texto é pequeno (o blit domina);
+o que importa é a memória limitada e o retângulo devolvido, que o
+dirty_rects.py usa.
+"""
+from collections import OrderedDict
+
+from pgzero import ptext
+
+
+class TextCache:
+    """LRU cache of rendered text surfaces, with hit and miss counters"""
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, text, fontsize=None, color='white', owidth=None, ocolor=None):
+        key = (text, fontsize, color, owidth, ocolor)
+        surf = self.surfaces.get(key)
+        if surf is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surf
+        self.misses += 1
+        surf = ptext.getsurf(text, fontsize=fontsize, color=color,
+                             owidth=owidth, ocolor=ocolor, cache=False)
+        self.surfaces[key] = surf
+        if len(self.surfaces) > self.maxsize:
+            self.surfaces.popitem(last=False)
+        return surf
+
+    def draw(self, screen, text, pos=None, center=None, **style):
+        """Blit text at pos (top-left) or center; return its Rect"""
+        surf = self.get(text, **style)
+        if center is not None:
+            rect = surf.get_rect(center=center)
+        else:
+            rect = surf.get_rect(topleft=pos)
+        screen.blit(surf, rect.topleft)
+        return rect
+
+    def clear(self):
+        self.surfaces.clear()
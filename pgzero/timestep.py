@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+Passo de física fixo (fixed timestep) com interpolação.
+
+O pgzero chama update(dt) uma vez por quadro, com um dt que varia conforme a
+máquina. Aqui o tempo de cada quadro é guardado num acumulador e a física
+avança sempre em passos do mesmo tamanho; o que sobra no acumulador vira o
+fator `alpha`, usado no draw() para interpolar entre o passo anterior e o
+atual.
+"""
+
+
+class FixedTimestep:
+    """Accumulates frame time and runs the physics in fixed-size steps"""
+    def __init__(self, step=1 / 120, max_steps=8):
+        self.step = step
+        # limite de passos por quadro: um quadro muito lento não pode gerar
+        # uma fila infinita de passos atrasados
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.alpha = 0.0
+
+    def reset(self):
+        """Drop the pending time; safe to call from inside step_fn"""
+        self.accumulator = 0.0
+        self.alpha = 0.0
+
+    def advance(self, dt, step_fn):
+        """Call step_fn(step) as many times as dt allows; return the count"""
+        if self.max_steps is not None:
+            dt = min(dt, self.step * self.max_steps)
+        self.accumulator += dt
+        steps = 0
+        while self.accumulator >= self.step:
+            if self.max_steps is not None and steps >= self.max_steps:
+                self.accumulator %= self.step
+                break
+            step_fn(self.step)
+            # step_fn pode ter chamado reset() (o herói morreu): o
+            # acumulador zerado não pode ficar negativo
+            self.accumulator = max(0.0, self.accumulator - self.step)
+            steps += 1
+        self.alpha = self.accumulator / self.step
+        return steps
+
+
+def lerp(a, b, t):
+    """Linear interpolation between a and b"""
+    return a + (b - a) * t
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+Menus guiados por eventos do mouse.
+
+Antes, o update() perguntava a cada quadro a cada botão se o mouse estava em
+cima dele, mesmo com o mouse parado, e o clique testava os retângulos um a
+um. Aqui os botões ficam numa grade espacial (spatial.py): o botão sob o
+mouse é achado olhando só a célula do ponto, o destaque (hover) só é
+recalculado em on_mouse_move() e o clique em on_mouse_down().
+
+O menu também sabe se algo mudou desde o último desenho (destaque, texto de
+um botão...). Parado, redraw() responde False e o draw() do jogo pode deixar
+a tela como está, sem apagar e desenhar tudo de novo.
+"""
+from pygame import Rect
+
+from spatial import SpatialHash
+
+CELL_SIZE = 64  # célula da grade dos botões, em pixels
+
+
+class Hotspot:
+    """Clickable screen area with no drawing of its own"""
+    __slots__ = ('rect', 'callback', 'hover')
+
+    def __init__(self, rect, callback):
+        self.rect = rect
+        self.callback = callback
+        self.hover = False
+
+
+class Menu:
+    """Widgets indexed by rect; hover and clicks come from mouse events.
+
+    A widget is anything with rect, callback and hover attributes.
+    """
+    def __init__(self, cell_size=CELL_SIZE):
+        self.index = SpatialHash(cell_size)
+        self.widgets = []
+        self.hovered = None
+        self.dirty = True
+
+    def add(self, widget):
+        self.widgets.append(widget)
+        self.index.insert(widget, widget.rect)
+        self.dirty = True
+        return widget
+
+    def clear(self):
+        self.widgets.clear()
+        self.index.clear()
+        self.hovered = None
+        self.dirty = True
+
+    def hit(self, pos):
+        """Widget under pos, or None"""
+        for widget in self.index.query(Rect(pos, (1, 1))):
+            if widget.rect.collidepoint(pos):
+                return widget
+        return None
+
+    def on_mouse_move(self, pos):
+        widget = self.hit(pos)
+        if widget is self.hovered:
+            return
+        if self.hovered is not None:
+            self.hovered.hover = False
+        if widget is not None:
+            widget.hover = True
+        self.hovered = widget
+        self.dirty = True
+
+    def on_mouse_down(self, pos):
+        """Run the callback of the widget under pos and return the widget"""
+        widget = self.hit(pos)
+        if widget is not None:
+            widget.callback()
+        return widget
+
+    def invalidate(self):
+        """Something drawn changed (a label, the screen): draw again"""
+        self.dirty = True
+
+    def redraw(self):
+        """True once after each change, when the menu must be drawn again"""
+        dirty = self.dirty
+        self.dirty = False
+        return dirty